@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import create_async_engine  # type: ignore[reportMis
 from app.core.config import get_database_url
 from app.models.base import Base
 from app.models.job import Job, JobExecution  # noqa: F401 - register models
+from app.models.stats import ExecutionStatsBucket, JobCounter  # noqa: F401
 
 config = context.config
 if config.config_file_name is not None:
@@ -0,0 +1,29 @@
+"""Add (created_at, id) and (job_id, started_at, id) indexes for keyset pagination.
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS ix_jobs_created_at_id ON jobs (created_at, id)")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_job_executions_job_id_started_at_id "
+        "ON job_executions (job_id, started_at, id)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_job_executions_job_id_started_at_id")
+    op.execute("DROP INDEX IF EXISTS ix_jobs_created_at_id")
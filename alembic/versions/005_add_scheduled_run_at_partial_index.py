@@ -0,0 +1,31 @@
+"""Partial index for the worker claim query; backfill run_at for SCHEDULED jobs.
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Claim predicate is now "status = 'SCHEDULED' AND run_at <= now()": a NULL run_at would never match
+    op.execute(
+        "UPDATE jobs SET run_at = created_at "
+        "WHERE run_at IS NULL AND status IN ('SCHEDULED', 'PAUSED', 'RUNNING')"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_jobs_scheduled_run_at ON jobs (run_at) WHERE status = 'SCHEDULED'"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_jobs_scheduled_run_at")
@@ -0,0 +1,32 @@
+"""Add locked_by / lease_expires_at to jobs for lease-based crash recovery.
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS locked_by TEXT")
+    op.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP WITH TIME ZONE")
+    # Recovery sweep only looks at RUNNING rows, so keep the index to those
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_jobs_running_lease_expires_at "
+        "ON jobs (lease_expires_at) WHERE status = 'RUNNING'"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_jobs_running_lease_expires_at")
+    op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS lease_expires_at")
+    op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS locked_by")
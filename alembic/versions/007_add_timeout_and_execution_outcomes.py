@@ -0,0 +1,35 @@
+"""Add jobs.timeout_seconds and TIMEOUT / CANCELLED execution outcomes.
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS timeout_seconds INTEGER")
+    for label in ("TIMEOUT", "CANCELLED"):
+        op.execute(f"""
+            DO $$
+            BEGIN
+                IF NOT EXISTS (SELECT 1 FROM pg_enum e JOIN pg_type t ON e.enumtypid = t.oid WHERE t.typname = 'executionstatus' AND e.enumlabel = '{label}') THEN
+                    ALTER TYPE executionstatus ADD VALUE '{label}';
+                END IF;
+            END$$;
+        """)
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS timeout_seconds")
+    # Enum values cannot be dropped without recreating the type; map them back to FAILED instead.
+    op.execute("UPDATE job_executions SET status = 'FAILED' WHERE status IN ('TIMEOUT', 'CANCELLED')")
@@ -0,0 +1,32 @@
+"""Add per-job retry backoff policy and the applied delay on executions.
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS retry_policy VARCHAR(32) NOT NULL DEFAULT 'exponential_jitter'"
+    )
+    op.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS retry_delay_seconds INTEGER NOT NULL DEFAULT 5")
+    op.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS retry_max_delay_seconds INTEGER NOT NULL DEFAULT 600")
+    op.execute("ALTER TABLE job_executions ADD COLUMN IF NOT EXISTS retry_delay_seconds DOUBLE PRECISION")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE job_executions DROP COLUMN IF EXISTS retry_delay_seconds")
+    op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS retry_max_delay_seconds")
+    op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS retry_delay_seconds")
+    op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS retry_policy")
@@ -0,0 +1,36 @@
+"""Add 'cron' schedule type with cron_expression / cron_timezone columns.
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_enum e JOIN pg_type t ON e.enumtypid = t.oid WHERE t.typname = 'scheduletype' AND e.enumlabel = 'cron') THEN
+                ALTER TYPE scheduletype ADD VALUE 'cron';
+            END IF;
+        END$$;
+    """)
+    op.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS cron_expression TEXT")
+    op.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS cron_timezone TEXT")
+
+
+def downgrade() -> None:
+    # Enum value cannot be dropped; stop cron jobs so nothing reschedules them.
+    op.execute("UPDATE jobs SET status = 'CANCELLED' WHERE schedule_type = 'cron' AND status IN ('SCHEDULED', 'PAUSED')")
+    op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS cron_timezone")
+    op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS cron_expression")
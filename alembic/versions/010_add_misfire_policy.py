@@ -0,0 +1,24 @@
+"""Add misfire_policy for anchored interval/cron scheduling.
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS misfire_policy VARCHAR(32) NOT NULL DEFAULT 'coalesce'")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS misfire_policy")
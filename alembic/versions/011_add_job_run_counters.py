@@ -0,0 +1,50 @@
+"""Add per-job run counters (rolled up from job_executions) for execution retention.
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS run_count INTEGER NOT NULL DEFAULT 0")
+    op.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS success_count INTEGER NOT NULL DEFAULT 0")
+    op.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS failure_count INTEGER NOT NULL DEFAULT 0")
+    op.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS last_duration_seconds DOUBLE PRECISION")
+    # Roll existing history into the counters before anything can be pruned
+    op.execute("""
+        UPDATE jobs j
+        SET run_count = s.runs,
+            success_count = s.successes,
+            failure_count = s.failures,
+            last_duration_seconds = s.last_duration
+        FROM (
+            SELECT
+                job_id,
+                count(*) AS runs,
+                count(*) FILTER (WHERE status = 'SUCCESS') AS successes,
+                count(*) FILTER (WHERE status IN ('FAILED', 'TIMEOUT')) AS failures,
+                (array_agg(EXTRACT(EPOCH FROM finished_at - started_at) ORDER BY started_at DESC))[1] AS last_duration
+            FROM job_executions
+            WHERE finished_at IS NOT NULL
+            GROUP BY job_id
+        ) s
+        WHERE s.job_id = j.id
+    """)
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS last_duration_seconds")
+    op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS failure_count")
+    op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS success_count")
+    op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS run_count")
@@ -0,0 +1,106 @@
+"""Range-partition job_executions by started_at (monthly partitions + default).
+
+Copies existing rows into the new partitioned table. The primary key becomes (id, started_at)
+because a partitioned table's unique constraints must include the partition key.
+Upcoming partitions are created (and expired ones dropped) by `python -m app.db.partitions`.
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "012"
+down_revision: Union[str, None] = "011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COLUMNS = "id, job_id, attempt_number, started_at, finished_at, status, error_message, result, retry_delay_seconds"
+
+
+def upgrade() -> None:
+    # Skipped when init_db() already created the table partitioned
+    op.execute(f"""
+        DO $$
+        DECLARE
+            lower_bound timestamptz;
+            upper_bound timestamptz;
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'job_executions'::regclass) THEN
+                RETURN;
+            END IF;
+
+            ALTER TABLE job_executions RENAME TO job_executions_unpartitioned;
+            ALTER INDEX IF EXISTS job_executions_pkey RENAME TO job_executions_unpartitioned_pkey;
+            DROP INDEX IF EXISTS ix_job_executions_job_id_started_at_id;
+
+            CREATE TABLE job_executions (
+                id UUID NOT NULL,
+                job_id UUID NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+                attempt_number INTEGER NOT NULL,
+                started_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+                finished_at TIMESTAMP WITH TIME ZONE,
+                status executionstatus NOT NULL,
+                error_message TEXT,
+                result TEXT,
+                retry_delay_seconds DOUBLE PRECISION,
+                PRIMARY KEY (id, started_at)
+            ) PARTITION BY RANGE (started_at);
+            CREATE INDEX ix_job_executions_job_id_started_at ON job_executions (job_id, started_at DESC, id DESC);
+            CREATE TABLE job_executions_default PARTITION OF job_executions DEFAULT;
+
+            -- Monthly partitions from the oldest existing row through three months ahead
+            SELECT date_trunc('month', coalesce(min(started_at), now()) AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+            INTO lower_bound FROM job_executions_unpartitioned;
+            WHILE lower_bound < date_trunc('month', now() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC' + interval '4 months' LOOP
+                upper_bound := (lower_bound AT TIME ZONE 'UTC' + interval '1 month') AT TIME ZONE 'UTC';
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF job_executions FOR VALUES FROM (%L) TO (%L)',
+                    'job_executions_p' || to_char(lower_bound AT TIME ZONE 'UTC', 'YYYYMMDD'),
+                    lower_bound,
+                    upper_bound
+                );
+                lower_bound := upper_bound;
+            END LOOP;
+
+            INSERT INTO job_executions ({_COLUMNS})
+            SELECT {_COLUMNS} FROM job_executions_unpartitioned;
+            DROP TABLE job_executions_unpartitioned;
+        END$$;
+    """)
+
+
+def downgrade() -> None:
+    op.execute(f"""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'job_executions'::regclass) THEN
+                RETURN;
+            END IF;
+
+            ALTER TABLE job_executions RENAME TO job_executions_partitioned;
+            ALTER INDEX IF EXISTS job_executions_pkey RENAME TO job_executions_partitioned_pkey;
+            ALTER INDEX IF EXISTS ix_job_executions_job_id_started_at RENAME TO ix_job_executions_partitioned_job_id_started_at;
+
+            CREATE TABLE job_executions (
+                id UUID NOT NULL PRIMARY KEY,
+                job_id UUID NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+                attempt_number INTEGER NOT NULL,
+                started_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+                finished_at TIMESTAMP WITH TIME ZONE,
+                status executionstatus NOT NULL,
+                error_message TEXT,
+                result TEXT,
+                retry_delay_seconds DOUBLE PRECISION
+            );
+            CREATE INDEX ix_job_executions_job_id_started_at_id ON job_executions (job_id, started_at, id);
+
+            INSERT INTO job_executions ({_COLUMNS})
+            SELECT {_COLUMNS} FROM job_executions_partitioned;
+            DROP TABLE job_executions_partitioned;
+        END$$;
+    """)
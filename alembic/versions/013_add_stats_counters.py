@@ -0,0 +1,56 @@
+"""Add job_counters and execution_stats for GET /api/jobs/stats, seeded from current data.
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "013"
+down_revision: Union[str, None] = "012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS job_counters (
+            schedule_type TEXT NOT NULL,
+            status TEXT NOT NULL,
+            shard SMALLINT NOT NULL,
+            count BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (schedule_type, status, shard)
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS execution_stats (
+            bucket TIMESTAMP WITH TIME ZONE NOT NULL,
+            outcome TEXT NOT NULL,
+            shard SMALLINT NOT NULL,
+            count BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (bucket, outcome, shard)
+        )
+    """)
+    # One-time seed; from here on the app maintains both incrementally
+    op.execute("DELETE FROM job_counters")
+    op.execute("""
+        INSERT INTO job_counters (schedule_type, status, shard, count)
+        SELECT schedule_type::text, status::text, 0, count(*) FROM jobs GROUP BY 1, 2
+    """)
+    op.execute("""
+        INSERT INTO execution_stats (bucket, outcome, shard, count)
+        SELECT date_trunc('minute', finished_at), status::text, 0, count(*)
+        FROM job_executions
+        WHERE finished_at >= now() - interval '25 hours'
+        GROUP BY 1, 2
+        ON CONFLICT DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS execution_stats")
+    op.execute("DROP TABLE IF EXISTS job_counters")
@@ -0,0 +1,31 @@
+"""Add job_type: which registered handler runs the job.
+
+Existing jobs with a webhook_url / callback_url in their payload become 'webhook'; the rest ran the
+old fallback (simulated sleep + quote fetch) and become 'demo' so they behave as before.
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "014"
+down_revision: Union[str, None] = "013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS job_type TEXT NOT NULL DEFAULT 'webhook'")
+    op.execute(
+        "UPDATE jobs SET job_type = 'demo' "
+        "WHERE coalesce(payload->>'webhook_url', payload->>'callback_url', '') !~ '^https?://'"
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS job_type")
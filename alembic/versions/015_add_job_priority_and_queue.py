@@ -0,0 +1,38 @@
+"""Add queue and priority to jobs, with partial indexes for priority-ordered claims.
+
+Existing jobs land in queue 'default' with priority 0, so workers without WORKER_QUEUES claim them as before.
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "015"
+down_revision: Union[str, None] = "014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS queue TEXT NOT NULL DEFAULT 'default'")
+    op.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS priority INTEGER NOT NULL DEFAULT 0")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_jobs_scheduled_queue_priority "
+        "ON jobs (queue, priority DESC, run_at) WHERE status = 'SCHEDULED'"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_jobs_scheduled_priority "
+        "ON jobs (priority DESC, run_at) WHERE status = 'SCHEDULED'"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_jobs_scheduled_priority")
+    op.execute("DROP INDEX IF EXISTS ix_jobs_scheduled_queue_priority")
+    op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS priority")
+    op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS queue")
@@ -0,0 +1,24 @@
+"""Add retry_of_run_at: the schedule slot a pending retry belongs to, so retries do not shift the grid.
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "016"
+down_revision: Union[str, None] = "015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS retry_of_run_at TIMESTAMP WITH TIME ZONE")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS retry_of_run_at")
@@ -1,7 +1,11 @@
 """Cron endpoint for GitHub Actions: trigger execution of pending jobs."""
-from fastapi import APIRouter, Header, HTTPException
+import time
+
+from fastapi import APIRouter, Header, HTTPException, Query
 
 from app.core.config import settings
+from app.db.partitions import maintain_partitions
+from app.services.retention import prune_executions
 from app.worker.main import run_execute_pending_jobs
 
 router = APIRouter()
@@ -19,16 +23,53 @@ def _check_cron_secret(x_cron_secret: str | None = Header(None, alias="X-Cron-Se
 
 @router.post("/execute-pending-jobs")
 async def execute_pending_jobs(
+    budget_seconds: float = Query(
+        default=settings.CRON_BUDGET_SECONDS,
+        gt=0,
+        le=settings.CRON_MAX_BUDGET_SECONDS,
+        description="Wall-clock budget for this tick; keep below the platform request timeout",
+    ),
+    concurrency: int = Query(
+        default=settings.CRON_CONCURRENCY, ge=1, le=settings.CRON_MAX_CONCURRENCY, description="Jobs run in parallel"
+    ),
+    max_jobs: int = Query(default=settings.CRON_MAX_JOBS, ge=1, le=settings.CRON_MAX_JOBS),
     x_cron_secret: str | None = Header(None, alias="X-Cron-Secret"),
 ) -> dict:
     """
-    Run one tick: crash recovery + process up to 10 pending jobs.
+    Run one tick: crash recovery, then claim and run pending jobs in parallel until the queue is empty,
+    max_jobs were claimed, or budget_seconds nearly runs out; then partition upkeep and retention with
+    what is left. Returns per-job timings.
     Called by GitHub Actions on a schedule. Requires header: X-Cron-Secret: <CRON_SECRET>.
     """
     _check_cron_secret(x_cron_secret)
-    stale_reset, jobs_processed = await run_execute_pending_jobs(max_jobs=10)
+    started = time.monotonic()
+    # Never plan on more than half the budget as reserve, so tiny budgets still run something
+    reserve = min(settings.CRON_BUDGET_RESERVE_SECONDS, budget_seconds / 4)
+    stale_reset, runs = await run_execute_pending_jobs(
+        max_jobs=max_jobs, budget_seconds=budget_seconds, concurrency=concurrency, reserve_seconds=reserve
+    )
+    elapsed = time.monotonic() - started
+    # No worker process in serverless deployments: spend what is left of the budget on execution
+    # history upkeep. Partitions first, so new executions never pile up in the default partition.
+    deadline = started + budget_seconds - reserve
+    created: list[str] = []
+    dropped: list[str] = []
+    if time.monotonic() < deadline:
+        try:
+            created, dropped = await maintain_partitions()
+        except Exception as e:
+            print(f"Partition maintenance error: {e}", flush=True)
+    executions_pruned = await prune_executions(deadline=deadline)
     return {
         "ok": True,
         "stale_reset": stale_reset,
-        "jobs_processed": jobs_processed,
+        "jobs_processed": len(runs),
+        "partitions_created": created,
+        "partitions_dropped": dropped,
+        "executions_pruned": executions_pruned,
+        "budget_seconds": budget_seconds,
+        "concurrency": concurrency,
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "jobs_per_second": round(len(runs) / elapsed, 2) if elapsed > 0 else None,
+        "jobs": runs,
     }
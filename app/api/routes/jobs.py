@@ -1,14 +1,38 @@
 """Job API endpoints."""
+from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.db.session import get_async_session
-from app.models.job import Job, JobStatus, ScheduleType
-from app.schemas.job import JobCreate, JobListResponse, JobResponse, JobUpdate
-from app.services.job_service import JobService
+from app.models.job import ExecutionStatus, Job, JobStatus, ScheduleType
+from app.schemas.job import (
+    BulkJobCreateResponse,
+    JobCreate,
+    JobExecutionListResponse,
+    JobListResponse,
+    JobResponse,
+    JobStatsResponse,
+    JobUpdate,
+)
+from app.services.bulk import bulk_create_jobs, decode_json_array, is_ndjson, iter_ndjson
+from app.services.events import job_events
+from app.services.export import (
+    EXECUTION_EXPORT_FIELDS,
+    JOB_EXPORT_FIELDS,
+    MEDIA_TYPES,
+    ExportFormat,
+    executions_export_query,
+    jobs_export_query,
+    stream_export,
+)
+from app.services.job_service import CountMode, JobService, StaleJobError
+from app.services.pagination import decode_cursor, encode_cursor
+from app.services.stats import get_job_stats
 
 router = APIRouter()
 
@@ -19,6 +43,29 @@ ALLOWED_STATUS_TRANSITIONS = {
 }
 
 
+def _check_range(after: Optional[datetime], before: Optional[datetime]) -> None:
+    if after is not None and before is not None and after >= before:
+        raise HTTPException(status_code=400, detail="Time range start must be before its end")
+
+
+def _export_response(chunks, fmt: ExportFormat, name: str) -> StreamingResponse:
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}-{stamp}.{fmt}"'},
+    )
+
+
+def _parse_cursor(cursor: Optional[str]) -> Optional[tuple[datetime, UUID]]:
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.post("", response_model=JobResponse)
 async def create_job(
     data: JobCreate,
@@ -26,28 +73,109 @@ async def create_job(
 ) -> Job:
     service = JobService(session)
     job = await service.create(data)
-    await session.refresh(job, ["executions"])
+    await service.load_recent_executions([job], settings.API_LIST_EXECUTIONS_PER_JOB)
     return job
 
 
+@router.post("/bulk", response_model=BulkJobCreateResponse)
+async def create_jobs_bulk(
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
+) -> dict:
+    """
+    Create many jobs: a JSON array of job bodies, or NDJSON (one per line, Content-Type
+    application/x-ndjson, inserted while the upload streams in). Invalid items are reported in
+    `results` and do not stop the rest.
+    """
+    if is_ndjson(request.headers.get("content-type")):
+        return await bulk_create_jobs(session, iter_ndjson(request.stream()))
+    try:
+        items = decode_json_array(await request.body())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await bulk_create_jobs(session, items)
+
+
 @router.get("", response_model=JobListResponse)
 async def list_jobs(
     status: Optional[JobStatus] = Query(None, description="Filter by status"),
     schedule_type: Optional[ScheduleType] = Query(None, description="Filter by schedule type"),
     limit: int = Query(100, ge=1, le=500),
-    offset: int = Query(0, ge=0),
+    offset: int = Query(0, ge=0, description="Ignored when cursor is set; prefer cursor for deep pages"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: CountMode = Query("exact", description="exact, estimate (planner statistics) or none"),
+    include_executions: bool = Query(True, description="Include recent executions for each job"),
+    executions_limit: int = Query(
+        settings.API_LIST_EXECUTIONS_PER_JOB, ge=1, le=100, description="Max recent executions per job"
+    ),
     session: AsyncSession = Depends(get_async_session),
 ) -> JobListResponse:
     service = JobService(session)
-    jobs, total = await service.list_jobs(
+    jobs, total, next_cursor = await service.list_jobs(
         status=status,
         schedule_type=schedule_type,
         limit=limit,
         offset=offset,
+        cursor=_parse_cursor(cursor),
+        count=count,
+    )
+    await service.load_recent_executions(jobs, executions_limit if include_executions else 0)
+    return JobListResponse(
+        jobs=jobs,
+        total=total,
+        next_cursor=encode_cursor(*next_cursor) if next_cursor else None,
+    )
+
+
+@router.get("/stats", response_model=JobStatsResponse)
+async def job_stats(session: AsyncSession = Depends(get_async_session)) -> dict:
+    """Counts by status and schedule type, queue depth and lag, execution success rates (5m / 1h / 24h)."""
+    return await get_job_stats(session)
+
+
+@router.get("/export")
+async def export_jobs(
+    format: ExportFormat = Query("ndjson", description="ndjson or csv"),
+    status: Optional[JobStatus] = Query(None),
+    schedule_type: Optional[ScheduleType] = Query(None),
+    created_after: Optional[datetime] = Query(None, description="Inclusive"),
+    created_before: Optional[datetime] = Query(None, description="Exclusive"),
+) -> StreamingResponse:
+    """Stream all matching jobs, oldest first, without paging or a row cap."""
+    _check_range(created_after, created_before)
+    query = jobs_export_query(status, schedule_type, created_after, created_before)
+    return _export_response(stream_export(query, JOB_EXPORT_FIELDS, format), format, "jobs")
+
+
+@router.get("/executions/export")
+async def export_executions(
+    format: ExportFormat = Query("ndjson", description="ndjson or csv"),
+    job_id: Optional[UUID] = Query(None),
+    status: Optional[ExecutionStatus] = Query(None),
+    started_after: Optional[datetime] = Query(None, description="Inclusive"),
+    started_before: Optional[datetime] = Query(None, description="Exclusive"),
+) -> StreamingResponse:
+    """Stream execution history, oldest first, across all jobs or one."""
+    _check_range(started_after, started_before)
+    query = executions_export_query(job_id, status, started_after, started_before)
+    return _export_response(stream_export(query, EXECUTION_EXPORT_FIELDS, format), format, "executions")
+
+
+@router.get("/events")
+async def job_event_stream(
+    job_id: Optional[UUID] = Query(None, description="Only events for this job (resyncs are always sent)"),
+) -> StreamingResponse:
+    """
+    Server-Sent Events: job_created, job_status, job_deleted, execution_started, execution_finished,
+    and resync (reload, events may have been missed). Holds no database session while open.
+    """
+    if not settings.EVENTS_ENABLED or not await job_events.ensure_listening():
+        raise HTTPException(status_code=503, detail="Live events unavailable")
+    return StreamingResponse(
+        job_events.stream(str(job_id) if job_id else None, settings.EVENTS_KEEPALIVE_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    for j in jobs:
-        await session.refresh(j, ["executions"])
-    return JobListResponse(jobs=jobs, total=total)
 
 
 @router.get("/{job_id}", response_model=JobResponse)
@@ -59,10 +187,27 @@ async def get_job(
     job = await service.get_by_id(job_id)
     if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
-    await session.refresh(job, ["executions"])
+    await service.load_recent_executions([job], settings.API_LIST_EXECUTIONS_PER_JOB)
     return job
 
 
+@router.get("/{job_id}/executions", response_model=JobExecutionListResponse)
+async def list_job_executions(
+    job_id: UUID,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    session: AsyncSession = Depends(get_async_session),
+) -> JobExecutionListResponse:
+    service = JobService(session)
+    if await service.get_by_id(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    executions, next_cursor = await service.list_executions(job_id, limit=limit, cursor=_parse_cursor(cursor))
+    return JobExecutionListResponse(
+        executions=executions,
+        next_cursor=encode_cursor(*next_cursor) if next_cursor else None,
+    )
+
+
 @router.patch("/{job_id}", response_model=JobResponse)
 async def update_job(
     job_id: UUID,
@@ -88,8 +233,13 @@ async def update_job(
                 data.status.value, job.status.value
             ),
         )
-    job = await service.update_status(job_id, data.status)
-    await session.refresh(job, ["executions"])
+    try:
+        job = await service.update_status(job_id, data.status, expected_version=job.version)
+    except StaleJobError:
+        raise HTTPException(status_code=409, detail="Job changed while updating; reload and try again")
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    await service.load_recent_executions([job], settings.API_LIST_EXECUTIONS_PER_JOB)
     return job
 
 
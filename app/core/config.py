@@ -39,19 +39,79 @@ class Settings(BaseSettings):
         return _normalize_database_url(self.DATABASE_URL)
 
     # Worker
-    WORKER_POLL_INTERVAL_SECONDS: int = 5
-    WORKER_STALE_RUNNING_MINUTES: int = 10  # Crash recovery: reset RUNNING older than this
+    WORKER_POLL_INTERVAL_SECONDS: int = 5  # Used when LISTEN is disabled or unavailable
+    WORKER_LISTEN_ENABLED: bool = True  # Wake on Postgres NOTIFY instead of fixed-interval polling
+    WORKER_FALLBACK_POLL_SECONDS: int = 30  # Safety-net poll while LISTEN is connected
+    WORKER_BATCH_SIZE: int = 10  # Jobs claimed per round trip; a full batch skips the poll sleep
+    WORKER_CONCURRENCY: int = 5  # Jobs run at once as asyncio tasks; no DB connection is held while a job executes
+    WORKER_CLAIM_OVERFETCH: int = 4  # Unlocked candidates read per claim slot; covers this many workers claiming at once
+    WORKER_QUEUES: str = ""  # Queues to claim from with weights, e.g. "critical:5,default:1"; empty = all queues
+    WORKER_STALE_RUNNING_MINUTES: int = 10  # Crash recovery for RUNNING rows without a lease (pre-lease rows)
+    WORKER_ID: str = ""  # Lease owner name; defaults to hostname:pid
+    WORKER_LEASE_SECONDS: int = 30  # A RUNNING job is recovered this long after its owner's last heartbeat
+    WORKER_HEARTBEAT_SECONDS: int = 10  # Lease renewal period; keep well below WORKER_LEASE_SECONDS
+    WORKER_RECOVERY_INTERVAL_SECONDS: int = 15  # How often the expired-lease sweep runs
+    WORKER_DEFAULT_TIMEOUT_SECONDS: int = 300  # Execution deadline for jobs without timeout_seconds
+    WORKER_MISFIRE_MAX_CATCHUP_RUNS: int = 10  # run_all misfire policy: most missed runs replayed per job
+    # Execution history retention: keep each job's newest N executions and/or those younger than the TTL (0 = off)
+    EXECUTION_RETENTION_KEEP_LAST: int = 1000
+    EXECUTION_RETENTION_TTL_HOURS: float = 0
+    EXECUTION_RETENTION_BATCH_SIZE: int = 1000  # Rows deleted per short transaction
+    EXECUTION_RETENTION_PAUSE_SECONDS: float = 0.05  # Pause between delete batches
+    EXECUTION_RETENTION_INTERVAL_SECONDS: int = 300  # How often the worker runs a retention pass
+    # job_executions partitions (by started_at): size, how many to create ahead, when to drop whole partitions
+    EXECUTION_PARTITION_INTERVAL: str = "month"  # day | week | month
+    EXECUTION_PARTITIONS_AHEAD: int = 3
+    EXECUTION_PARTITION_DROP_AFTER_DAYS: float = 0  # 0 = never drop; otherwise a hard cap on history age
+    # Job handlers (job_type). shell and python run arbitrary code on the worker: keep them off unless needed
+    JOB_HANDLER_MODULES: str = ""  # Comma-separated modules imported at startup to register custom handlers
+    WORKER_SHELL_HANDLER_ENABLED: bool = False
+    WORKER_PYTHON_HANDLER_ENABLED: bool = False
+    WORKER_PYTHON_HANDLER_MODULES: str = ""  # Module prefixes python / python_cpu may import; empty = handlers off
+    WORKER_CPU_PROCESSES: int = 2  # Process pool for kind="cpu" handlers; 0 = run them in threads instead
+    WORKER_CPU_MAX_TASKS_PER_CHILD: int = 0  # Replace a pool process after this many jobs (0 = never)
+    # demo job_type only: simulated work time and failure rate
     WORKER_EXECUTION_MIN_SLEEP: int = 1
     WORKER_EXECUTION_MAX_SLEEP: int = 3
     WORKER_FAILURE_PROBABILITY: float = 0.0  # 0 = reliable demo; set 0.3 to test retries
 
+    # Worker HTTP client (shared keep-alive pool for webhook / quote executions)
+    WORKER_HTTP_TIMEOUT_SECONDS: float = 10.0
+    WORKER_HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    WORKER_HTTP_MAX_CONNECTIONS: int = 100
+    WORKER_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    WORKER_HTTP_MAX_CONNECTIONS_PER_HOST: int = 10
+    WORKER_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    WORKER_HTTP2: bool = False  # Needs the 'h2' package (pip install httpx[http2])
+    WORKER_HTTP_VERIFY_TLS: bool = False
+
+    # Stats (GET /api/jobs/stats): counter rows per key, and how often workers recount jobs to repair drift (0 = never)
+    STATS_COUNTER_SHARDS: int = 8
+    STATS_RECONCILE_INTERVAL_SECONDS: int = 0  # Opt-in recount of job_counters from jobs (full scan); 0 = never
+
+    # Live job events (GET /api/jobs/events, Server-Sent Events over one LISTEN connection per API process)
+    EVENTS_ENABLED: bool = True  # Also controls whether API and worker publish job_events notifications
+    EVENTS_KEEPALIVE_SECONDS: float = 15.0
+    EVENTS_SUBSCRIBER_QUEUE_SIZE: int = 256  # Per-client backlog; a client that falls behind gets a resync event
+
     # API
     API_TITLE: str = "Job Scheduler & Execution Engine"
     API_VERSION: str = "1.0.0"
+    API_LIST_EXECUTIONS_PER_JOB: int = 5  # Executions embedded per job in job responses (GET /api/jobs default, single-job endpoints)
+    JOBS_BULK_BATCH_SIZE: int = 1000  # POST /api/jobs/bulk: jobs per multi-row INSERT (and per transaction)
+    JOBS_BULK_MAX_ITEMS: int = 100000  # Reading stops here; the rest of the upload is one failed result
+    EXPORT_BATCH_SIZE: int = 1000  # Rows fetched per server-side cursor round trip by the export endpoints
+    METRICS_ENABLED: bool = True  # Prometheus GET /metrics on the API and on the worker health port
     DEBUG: bool = False  # If True, 500 responses include error detail (set in Vercel for debugging)
 
     # Cron (GitHub Actions → POST /api/cron/execute-pending-jobs). Set in Render; add same value as GitHub secret CRON_SECRET.
     CRON_SECRET: str = ""
+    CRON_BUDGET_SECONDS: float = 25.0  # Default wall-clock budget per tick; keep below the platform request timeout
+    CRON_MAX_BUDGET_SECONDS: float = 900.0
+    CRON_BUDGET_RESERVE_SECONDS: float = 2.0  # Kept back to finalize jobs and respond; no claims in the last 2x this
+    CRON_CONCURRENCY: int = 5  # Jobs run in parallel per tick
+    CRON_MAX_CONCURRENCY: int = 50
+    CRON_MAX_JOBS: int = 1000  # Upper bound on jobs claimed per tick
 
 
 @lru_cache
@@ -0,0 +1,131 @@
+"""Cron expressions: parse standard 5-field cron once (cached) and compute next fire times."""
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+_MONTH_NAMES = {n: i for i, n in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1
+)}
+_DOW_NAMES = {n: i for i, n in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])}
+_MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+# How far ahead next_after searches before deciding an expression never fires (e.g. "0 0 30 2 *")
+_SEARCH_YEARS = 30
+
+
+def _parse_value(token: str, names: dict[str, int]) -> int:
+    token = token.strip().lower()
+    if token in names:
+        return names[token]
+    if not token.isdigit():
+        raise ValueError(f"invalid value '{token}'")
+    return int(token)
+
+
+def _parse_field(field: str, low: int, high: int, names: dict[str, int]) -> frozenset[int]:
+    values: set[int] = set()
+    for part in field.split(","):
+        if not part:
+            raise ValueError("empty list item")
+        step = 1
+        if "/" in part:
+            part, step_s = part.split("/", 1)
+            if not step_s.isdigit() or int(step_s) == 0:
+                raise ValueError(f"invalid step '{step_s}'")
+            step = int(step_s)
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            a, b = part.split("-", 1)
+            start, end = _parse_value(a, names), _parse_value(b, names)
+        else:
+            start = _parse_value(part, names)
+            end = high if step > 1 else start
+        if not (low <= start <= high and low <= end <= high) or start > end:
+            raise ValueError(f"'{part}' out of range {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
+class CronSchedule:
+    """Parsed expression: the allowed values of each field. Immutable, so safe to share from the cache."""
+
+    minutes: tuple[int, ...]
+    hours: tuple[int, ...]
+    days: frozenset[int]
+    months: frozenset[int]
+    weekdays: frozenset[int]  # 0 = Sunday
+    day_restricted: bool
+    weekday_restricted: bool
+
+    def _day_matches(self, t: datetime) -> bool:
+        dom = t.day in self.days
+        dow = (t.isoweekday() % 7) in self.weekdays
+        # Vixie cron: when both day fields are restricted, either may match
+        if self.day_restricted and self.weekday_restricted:
+            return dom or dow
+        return dom and dow
+
+    def next_after(self, after: datetime) -> datetime:
+        """First matching minute strictly after `after` (naive wall-clock time)."""
+        t = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        last_year = t.year + _SEARCH_YEARS
+        while t.year <= last_year:
+            if t.month not in self.months:
+                t = datetime(t.year + (t.month == 12), t.month % 12 + 1, 1)
+                continue
+            if not self._day_matches(t):
+                t = datetime(t.year, t.month, t.day) + timedelta(days=1)
+                continue
+            i = bisect_left(self.hours, t.hour)
+            if i == len(self.hours):
+                t = datetime(t.year, t.month, t.day) + timedelta(days=1)
+                continue
+            if self.hours[i] != t.hour:
+                t = datetime(t.year, t.month, t.day, self.hours[i])
+                continue
+            j = bisect_left(self.minutes, t.minute)
+            if j == len(self.minutes):
+                t = datetime(t.year, t.month, t.day, t.hour) + timedelta(hours=1)
+                continue
+            return t.replace(minute=self.minutes[j])
+        raise ValueError("cron expression never fires")
+
+
+def get_timezone(name: Optional[str]) -> ZoneInfo:
+    """ZoneInfo for an IANA name (UTC when empty). Raises ValueError for unknown zones."""
+    try:
+        return ZoneInfo(name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError) as e:
+        raise ValueError(f"unknown timezone '{name}'") from e
+
+
+@lru_cache(maxsize=4096)
+def parse_cron(expression: str) -> CronSchedule:
+    """Parse 'minute hour day-of-month month day-of-week' (or an @macro). Raises ValueError if invalid."""
+    expr = _MACROS.get(expression.strip().lower(), expression)
+    fields = expr.split()
+    if len(fields) != 5:
+        raise ValueError("cron expression must have 5 fields: minute hour day month weekday")
+    minute, hour, day, month, weekday = fields
+    weekdays = _parse_field(weekday, 0, 7, _DOW_NAMES)
+    return CronSchedule(
+        minutes=tuple(sorted(_parse_field(minute, 0, 59, {}))),
+        hours=tuple(sorted(_parse_field(hour, 0, 23, {}))),
+        days=_parse_field(day, 1, 31, {}),
+        months=_parse_field(month, 1, 12, _MONTH_NAMES),
+        weekdays=frozenset(d % 7 for d in weekdays),  # 7 is also Sunday
+        day_restricted=not day.startswith("*"),
+        weekday_restricted=not weekday.startswith("*"),
+    )
@@ -0,0 +1,120 @@
+"""
+Job type registry: which handler runs a job of a given job_type, and whether that type is enabled.
+
+The API validates job_type against it and the worker dispatches through it. Handlers register with
+@register_handler in app.worker.handlers (built-ins) or in modules listed in JOB_HANDLER_MODULES;
+both are imported on first lookup, so this module never imports the worker itself.
+"""
+import importlib
+import inspect
+from dataclasses import dataclass
+from typing import Any, Callable, Literal, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+
+HandlerKind = Literal["io", "cpu"]
+HandlerResult = Tuple[bool, Optional[str]]
+# Registers webhook, shell, python, python_cpu, noop and demo
+BUILTIN_HANDLER_MODULE = "app.worker.handlers"
+# job_type when a create request leaves it out: webhook if the payload has a webhook URL, else the
+# simulated demo work that such jobs ran before job types existed (as migration 014 maps them)
+DEFAULT_JOB_TYPE = "webhook"
+FALLBACK_JOB_TYPE = "demo"
+
+
+class JobContext(NamedTuple):
+    """What a handler gets: plain values only, so it can be pickled to another process."""
+
+    job_id: str
+    name: str
+    job_type: str
+    schedule_type: str
+    attempt: int
+    payload: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class JobHandler:
+    name: str
+    func: Callable[..., Any]  # io: async (JobContext); cpu: (job_id, payload)
+    kind: HandlerKind = "io"
+    enabled: Callable[[], bool] = lambda: True
+    # Checked on create so a job that can never run is a 422, not a run of failed attempts
+    validate: Optional[Callable[[dict[str, Any]], None]] = None
+
+
+_registry: dict[str, JobHandler] = {}
+_modules_loaded = False
+
+
+def register_handler(
+    name: str,
+    kind: HandlerKind = "io",
+    enabled: Optional[Callable[[], bool]] = None,
+    validate: Optional[Callable[[dict[str, Any]], None]] = None,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Decorator: run `func` for jobs with job_type `name`. Registering a name again replaces it.
+    `validate(payload)` raises ValueError for a payload the handler can never run.
+    """
+    if kind not in ("io", "cpu"):
+        raise ValueError(f"handler kind must be 'io' or 'cpu', not '{kind}'")
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        if kind == "io" and not inspect.iscoroutinefunction(func):
+            raise TypeError(f"io handler '{name}' must be an async function")
+        if kind == "cpu" and inspect.iscoroutinefunction(func):
+            raise TypeError(f"cpu handler '{name}' must be a plain function")
+        _registry[name] = JobHandler(name, func, kind, enabled or (lambda: True), validate)
+        return func
+
+    return decorator
+
+
+def _load_handler_modules() -> None:
+    """Import the built-ins and JOB_HANDLER_MODULES once so their @register_handler calls run."""
+    global _modules_loaded
+    if _modules_loaded:
+        return
+    _modules_loaded = True
+    for module in [BUILTIN_HANDLER_MODULE, *(m.strip() for m in settings.JOB_HANDLER_MODULES.split(","))]:
+        if module:
+            importlib.import_module(module)
+
+
+def get_handler(job_type: str) -> Optional[JobHandler]:
+    _load_handler_modules()
+    return _registry.get(job_type)
+
+
+def registered_handlers() -> list[JobHandler]:
+    _load_handler_modules()
+    return sorted(_registry.values(), key=lambda h: h.name)
+
+
+def check_job_type(job_type: str) -> str:
+    """`job_type` if a handler is registered and enabled for it; ValueError otherwise."""
+    handler = get_handler(job_type)
+    if handler is None:
+        raise ValueError(
+            f"unknown job_type '{job_type}' (registered: {', '.join(h.name for h in registered_handlers())})"
+        )
+    if not handler.enabled():
+        raise ValueError(f"job_type '{job_type}' is disabled")
+    return job_type
+
+
+def check_job_payload(job_type: str, payload: Optional[dict[str, Any]]) -> None:
+    """ValueError if the handler for `job_type` rejects `payload`."""
+    handler = get_handler(job_type)
+    if handler is not None and handler.validate is not None:
+        handler.validate(payload or {})
+
+
+def default_job_type(payload: Optional[dict[str, Any]]) -> str:
+    """job_type for a create request without one: webhook if its payload would run, else demo."""
+    try:
+        check_job_payload(DEFAULT_JOB_TYPE, payload)
+    except ValueError:
+        return FALLBACK_JOB_TYPE
+    return DEFAULT_JOB_TYPE
@@ -0,0 +1,43 @@
+"""
+Prometheus metrics for the API and worker hot paths. Served at GET /metrics on the API and on the
+worker's health port. Each process exposes its own registry; Prometheus aggregates across them.
+"""
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+# Sub-millisecond to tens of seconds: claim queries and HTTP handlers
+_FAST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Job executions run up to their timeout (minutes)
+_EXECUTION_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+CLAIM_SECONDS = Histogram(
+    "scheduler_claim_seconds", "Time of the claim query (UPDATE ... FOR UPDATE SKIP LOCKED)", buckets=_FAST_BUCKETS
+)
+EXECUTION_SECONDS = Histogram(
+    "scheduler_execution_seconds", "Job execution time by outcome", ["outcome"], buckets=_EXECUTION_BUCKETS
+)
+WEBHOOK_SECONDS = Histogram(
+    "scheduler_webhook_seconds", "Webhook POST latency by response class (2xx, 4xx, 5xx, error)", ["status"],
+    buckets=_FAST_BUCKETS,
+)
+JOBS_PROCESSED = Counter("scheduler_jobs_processed_total", "Finished executions by outcome", ["outcome"])
+JOBS_FAILED = Counter("scheduler_jobs_failed_total", "Jobs moved to FAILED after exhausting their retries")
+JOBS_RETRIED = Counter("scheduler_jobs_retried_total", "Failed attempts rescheduled for a retry")
+JOBS_RECOVERED = Counter("scheduler_jobs_recovered_total", "RUNNING jobs with an expired lease reset to SCHEDULED")
+QUEUE_LAG_SECONDS = Gauge(
+    "scheduler_queue_lag_seconds",
+    "How late the oldest job of the last full claim batch was (0 once a claim drains the due queue)",
+)
+JOBS_IN_FLIGHT = Gauge("scheduler_jobs_in_flight", "Jobs currently executing in this process")
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "API request latency by route template", ["method", "route", "status"],
+    buckets=_FAST_BUCKETS,
+)
+
+
+def status_class(status_code: int) -> str:
+    return f"{status_code // 100}xx"
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Exposition text of the default registry and its content type."""
+    return generate_latest(), CONTENT_TYPE_LATEST
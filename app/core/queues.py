@@ -0,0 +1,24 @@
+"""Job queue names and the WORKER_QUEUES format ("critical:5,default:1"); the claiming side is app.worker.queues."""
+DEFAULT_QUEUE = "default"
+# Queue names: no ',' or ':' so they can be listed in WORKER_QUEUES
+QUEUE_NAME_PATTERN = r"^[A-Za-z0-9_.-]+$"
+
+
+def parse_queue_weights(spec: str) -> dict[str, int]:
+    """'critical:5,default:1' (a missing weight is 1) to {'critical': 5, 'default': 1}. Raises ValueError."""
+    weights: dict[str, int] = {}
+    for item in (part.strip() for part in spec.split(",")):
+        if not item:
+            continue
+        name, sep, weight = item.partition(":")
+        name = name.strip()
+        if not name:
+            raise ValueError(f"WORKER_QUEUES entry '{item}' has no queue name")
+        try:
+            value = int(weight) if sep else 1
+        except ValueError:
+            raise ValueError(f"WORKER_QUEUES weight for '{name}' must be an integer, got '{weight}'")
+        if value < 1:
+            raise ValueError(f"WORKER_QUEUES weight for '{name}' must be >= 1")
+        weights[name] = value
+    return weights
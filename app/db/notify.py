@@ -0,0 +1,50 @@
+"""
+Postgres NOTIFY helpers: tell workers a job became due without waiting for their next poll,
+and tell API processes about job changes for the live event stream.
+"""
+import json
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+JOBS_READY_CHANNEL = "jobs_ready"
+JOB_EVENTS_CHANNEL = "job_events"
+
+
+async def notify_job_ready(session: AsyncSession, run_at: Optional[datetime] = None) -> None:
+    """
+    Queue a NOTIFY on JOBS_READY_CHANNEL; Postgres delivers it when the transaction commits.
+    Payload is the job's run_at (ISO) so listeners can set a timer for future jobs; empty means due now.
+    """
+    if session.bind.dialect.name != "postgresql":
+        return
+    payload = run_at.isoformat() if run_at is not None else ""
+    await session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": JOBS_READY_CHANNEL, "payload": payload},
+    )
+
+
+def job_event(event: str, job_id: Any, **fields: Any) -> dict[str, Any]:
+    """One job_events payload. Keep fields small: NOTIFY payloads are capped at 8000 bytes."""
+    return {"event": event, "job_id": str(job_id) if job_id is not None else None, **fields}
+
+
+async def notify_job_events(session: AsyncSession, events: Iterable[dict[str, Any]]) -> None:
+    """
+    Queue one NOTIFY per event on JOB_EVENTS_CHANNEL in a single statement; Postgres delivers them
+    on commit, so subscribers never see changes that were rolled back.
+    """
+    if not settings.EVENTS_ENABLED or session.bind.dialect.name != "postgresql":
+        return
+    payloads = [json.dumps(e, default=str, separators=(",", ":")) for e in events]
+    if not payloads:
+        return
+    await session.execute(
+        text("SELECT pg_notify(:channel, p) FROM unnest(CAST(:payloads AS text[])) AS p"),
+        {"channel": JOB_EVENTS_CHANNEL, "payloads": payloads},
+    )
@@ -0,0 +1,203 @@
+"""
+job_executions is range-partitioned by started_at (migration 012). This module creates upcoming
+partitions ahead of time and drops expired ones (DROP TABLE, no row-by-row DELETE).
+
+Run by the worker on its retention timer, by each serverless cron tick, or by hand:
+    python -m app.db.partitions [--ahead 3] [--drop-after-days 90] [--dry-run]
+"""
+import argparse
+import asyncio
+import re
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple, Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.session import async_session_factory, engine
+
+PARENT_TABLE = "job_executions"
+DEFAULT_PARTITION = "job_executions_default"
+PARTITION_INTERVALS = ("day", "week", "month")
+
+_BOUND_RE = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+class Partition(NamedTuple):
+    name: str
+    lower: datetime
+    upper: datetime
+
+
+def period_start(t: datetime, interval: str) -> datetime:
+    """Start (UTC midnight) of the day / ISO week / month containing `t`."""
+    day = t.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == "day":
+        return day
+    if interval == "week":
+        return day - timedelta(days=day.weekday())
+    if interval == "month":
+        return day.replace(day=1)
+    raise ValueError(f"unknown partition interval '{interval}' (use one of {', '.join(PARTITION_INTERVALS)})")
+
+
+def next_period(start: datetime, interval: str) -> datetime:
+    if interval == "day":
+        return start + timedelta(days=1)
+    if interval == "week":
+        return start + timedelta(days=7)
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def partition_name(lower: datetime) -> str:
+    return f"{PARENT_TABLE}_p{lower:%Y%m%d}"
+
+
+def planned_partitions(now: datetime, interval: str, ahead: int) -> list[Partition]:
+    """The current period's partition and `ahead` more after it."""
+    lower = period_start(now, interval)
+    planned = []
+    for _ in range(ahead + 1):
+        upper = next_period(lower, interval)
+        planned.append(Partition(partition_name(lower), lower, upper))
+        lower = upper
+    return planned
+
+
+def parse_bound(bound: str) -> Optional[tuple[datetime, datetime]]:
+    """(lower, upper) from pg_get_expr(relpartbound); None for the DEFAULT partition."""
+    match = _BOUND_RE.search(bound or "")
+    if match is None:
+        return None
+    return datetime.fromisoformat(match.group(1)), datetime.fromisoformat(match.group(2))
+
+
+async def is_partitioned() -> bool:
+    if engine.dialect.name != "postgresql":
+        return False
+    async with async_session_factory() as session:
+        result = await session.execute(
+            text(
+                "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+                "WHERE partrelid = to_regclass(:parent))"
+            ),
+            {"parent": PARENT_TABLE},
+        )
+        return bool(result.scalar_one())
+
+
+async def list_partitions() -> list[Partition]:
+    """Existing range partitions (not the default one), oldest first."""
+    async with async_session_factory() as session:
+        rows = (
+            await session.execute(
+                text(
+                    "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+                    "JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = to_regclass(:parent)"
+                ),
+                {"parent": PARENT_TABLE},
+            )
+        ).all()
+    partitions = []
+    for name, bound in rows:
+        bounds = parse_bound(bound)
+        if bounds is not None:
+            partitions.append(Partition(name, *bounds))
+    return sorted(partitions, key=lambda p: p.lower)
+
+
+async def create_partitions(ahead: int, interval: str, now: Optional[datetime] = None, dry_run: bool = False) -> list[str]:
+    """
+    Create the current and next `ahead` partitions that do not exist yet. Each is created in its own
+    transaction; a range that overlaps an existing partition, or whose rows already landed in the
+    default partition, is skipped with a message.
+    """
+    existing = await list_partitions()
+    created = []
+    for part in planned_partitions(now or datetime.now(timezone.utc), interval, ahead):
+        if any(p.lower < part.upper and part.lower < p.upper for p in existing):
+            continue
+        if dry_run:
+            created.append(part.name)
+            continue
+        async with async_session_factory() as session:
+            try:
+                await session.execute(
+                    text(
+                        f'CREATE TABLE IF NOT EXISTS "{part.name}" PARTITION OF {PARENT_TABLE} '
+                        f"FOR VALUES FROM ('{part.lower.isoformat()}') TO ('{part.upper.isoformat()}')"
+                    )
+                )
+                await session.commit()
+                created.append(part.name)
+            except Exception as e:
+                await session.rollback()
+                print(f"Partition {part.name} not created: {e}", flush=True)
+    return created
+
+
+async def drop_expired_partitions(older_than: datetime, dry_run: bool = False) -> list[str]:
+    """Drop partitions whose whole range is before `older_than`. O(1) per partition, whatever its row count."""
+    dropped = []
+    for part in await list_partitions():
+        if part.upper > older_than:
+            continue
+        if not dry_run:
+            async with async_session_factory() as session:
+                try:
+                    await session.execute(text(f'DROP TABLE IF EXISTS "{part.name}"'))
+                    await session.commit()
+                except Exception as e:
+                    await session.rollback()
+                    print(f"Partition {part.name} not dropped: {e}", flush=True)
+                    continue
+        dropped.append(part.name)
+    return dropped
+
+
+async def maintain_partitions(
+    ahead: Optional[int] = None, drop_after_days: Optional[float] = None, dry_run: bool = False
+) -> tuple[list[str], list[str]]:
+    """
+    Create upcoming partitions (EXECUTION_PARTITIONS_AHEAD) and drop those older than
+    EXECUTION_PARTITION_DROP_AFTER_DAYS (0 = keep). No-op when job_executions is not partitioned.
+    Returns (created, dropped) partition names.
+    """
+    if not await is_partitioned():
+        return [], []
+    ahead = settings.EXECUTION_PARTITIONS_AHEAD if ahead is None else ahead
+    drop_after_days = settings.EXECUTION_PARTITION_DROP_AFTER_DAYS if drop_after_days is None else drop_after_days
+    created = await create_partitions(max(0, ahead), settings.EXECUTION_PARTITION_INTERVAL, dry_run=dry_run)
+    dropped: list[str] = []
+    if drop_after_days > 0:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=drop_after_days)
+        dropped = await drop_expired_partitions(cutoff, dry_run=dry_run)
+    return created, dropped
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Create upcoming and drop expired job_executions partitions")
+    parser.add_argument("--ahead", type=int, default=None, help="Partitions to keep ready after the current one")
+    parser.add_argument("--drop-after-days", type=float, default=None, help="Drop partitions older than this (0 = keep)")
+    parser.add_argument("--dry-run", action="store_true", help="Only print what would change")
+    args = parser.parse_args()
+
+    async def run() -> None:
+        try:
+            if not await is_partitioned():
+                print(f"{PARENT_TABLE} is not partitioned; run `alembic upgrade head` first", flush=True)
+                return
+            created, dropped = await maintain_partitions(args.ahead, args.drop_after_days, args.dry_run)
+            prefix = "Would " if args.dry_run else ""
+            print(f"{prefix}create: {', '.join(created) or '-'}", flush=True)
+            print(f"{prefix}drop: {', '.join(dropped) or '-'}", flush=True)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 """Async database session and engine."""
 from collections.abc import AsyncGenerator
+from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
@@ -41,6 +42,14 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def connect_raw() -> Any:
+    """Open a dedicated asyncpg connection outside the pool (e.g. for LISTEN, which must outlive any session)."""
+    import asyncpg
+
+    dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+    return await asyncpg.connect(dsn, ssl=True if _need_ssl else None)
+
+
 async def init_db() -> None:
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -1,16 +1,21 @@
 """FastAPI application entrypoint."""
 import logging
+import time
 from pathlib import Path
 
 from contextlib import asynccontextmanager
 from sqlalchemy import text
 from fastapi import FastAPI, Request
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 
 from app.api.routes import api_router
+from app.core import metrics
 from app.core.config import settings
 from app.db.session import engine, init_db
+from app.services.events import job_events
+from app.worker.cpu import close_cpu_pool
+from app.worker.http import close_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +41,10 @@ async def lifespan(app: FastAPI):
     logger.info("Database: %s", _redact_url(settings.DATABASE_URL))
     await init_db()
     yield
+    await job_events.close()
+    # Cron endpoint runs jobs in-process and shares the worker's HTTP client
+    await close_http_client()
+    await close_cpu_pool()
 
 
 app = FastAPI(
@@ -46,6 +55,22 @@ app = FastAPI(
 app.include_router(api_router, prefix="/api")
 
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """HTTP latency per route template (/api/jobs/{job_id}, not each id); unmatched paths share one label."""
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        metrics.HTTP_REQUEST_SECONDS.labels(
+            request.method, getattr(route, "path", "unmatched"), metrics.status_class(status)
+        ).observe(time.perf_counter() - started)
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception) -> JSONResponse:
     """Return JSON for all unhandled errors; include detail when DEBUG=1."""
@@ -74,6 +99,14 @@ async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics() -> Response:
+    if not settings.METRICS_ENABLED:
+        return Response(status_code=404)
+    body, content_type = metrics.render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 @app.get("/health/db")
 async def health_db() -> JSONResponse:
     """Check DB connectivity; returns 200 and db status or 503 with error message."""
@@ -1,4 +1,15 @@
-from app.models.job import Job, JobExecution, JobStatus, ScheduleType
+from app.models.job import Job, JobExecution, JobStatus, MisfirePolicy, RetryPolicy, ScheduleType
 from app.models.base import Base
+from app.models.stats import ExecutionStatsBucket, JobCounter
 
-__all__ = ["Base", "Job", "JobExecution", "JobStatus", "ScheduleType"]
+__all__ = [
+    "Base",
+    "ExecutionStatsBucket",
+    "Job",
+    "JobCounter",
+    "JobExecution",
+    "JobStatus",
+    "MisfirePolicy",
+    "RetryPolicy",
+    "ScheduleType",
+]
@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import Any, Dict, Optional
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Integer, Text, TypeDecorator, func
+from sqlalchemy import DDL, DateTime, Enum, Float, ForeignKey, Index, Integer, Text, TypeDecorator, event, func, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -14,10 +14,11 @@ from app.models.base import Base
 class ScheduleType(str, enum.Enum):
     ONE_TIME = "one_time"
     INTERVAL = "interval"
+    CRON = "cron"
 
 
 class ScheduleTypeColumn(TypeDecorator[str]):
-    """Forces ScheduleType to be stored as its .value ('one_time'/'interval') in PostgreSQL."""
+    """Forces ScheduleType to be stored as its .value ('one_time'/'interval'/'cron') in PostgreSQL."""
 
     impl = Text
     cache_ok = True
@@ -44,6 +45,20 @@ class ScheduleTypeColumn(TypeDecorator[str]):
         return ScheduleType(value) if value else None
 
 
+class RetryPolicy(str, enum.Enum):
+    FIXED = "fixed"
+    EXPONENTIAL = "exponential"
+    EXPONENTIAL_JITTER = "exponential_jitter"
+
+
+class MisfirePolicy(str, enum.Enum):
+    """What a recurring job does with fire times missed while it was late (outage, backlog, long run)."""
+
+    COALESCE = "coalesce"
+    RUN_ALL = "run_all"
+    SKIP = "skip"
+
+
 class JobStatus(str, enum.Enum):
     SCHEDULED = "SCHEDULED"
     RUNNING = "RUNNING"
@@ -56,27 +71,86 @@ class JobStatus(str, enum.Enum):
 class ExecutionStatus(str, enum.Enum):
     SUCCESS = "SUCCESS"
     FAILED = "FAILED"
+    TIMEOUT = "TIMEOUT"
+    CANCELLED = "CANCELLED"
 
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Keyset pagination: ORDER BY created_at DESC, id DESC
+        Index("ix_jobs_created_at_id", "created_at", "id"),
+        # Claim queue: only SCHEDULED rows, ordered by due time; COMPLETED/FAILED history never enters it
+        Index("ix_jobs_scheduled_run_at", "run_at", postgresql_where=text("status = 'SCHEDULED'")),
+        # Priority claims: per subscribed queue, and across all queues for workers without WORKER_QUEUES
+        Index(
+            "ix_jobs_scheduled_queue_priority",
+            "queue",
+            text("priority DESC"),
+            "run_at",
+            postgresql_where=text("status = 'SCHEDULED'"),
+        ),
+        Index(
+            "ix_jobs_scheduled_priority",
+            text("priority DESC"),
+            "run_at",
+            postgresql_where=text("status = 'SCHEDULED'"),
+        ),
+        # Lease recovery sweep: only RUNNING rows
+        Index(
+            "ix_jobs_running_lease_expires_at",
+            "lease_expires_at",
+            postgresql_where=text("status = 'RUNNING'"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
     name: Mapped[str] = mapped_column(Text, nullable=False, index=True)
     payload: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    # Which registered handler runs the job (app.core.job_types); payload is that handler's input
+    job_type: Mapped[str] = mapped_column(Text, nullable=False, default="webhook", server_default="webhook")
+    # Claim order: workers take from the queues they subscribe to (WORKER_QUEUES), highest priority first
+    queue: Mapped[str] = mapped_column(Text, nullable=False, default="default", server_default="default")
+    priority: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
     schedule_type: Mapped[ScheduleType] = mapped_column(
         ScheduleTypeColumn(),
         nullable=False,
     )
     run_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # While a recurring job waits for a retry (run_at = now + backoff): the grid slot being retried
+    retry_of_run_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     interval_seconds: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    cron_expression: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    cron_timezone: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Recurring jobs: runs stay anchored to run_at + k*interval (or cron fire times); this decides missed runs
+    misfire_policy: Mapped[MisfirePolicy] = mapped_column(
+        Enum(MisfirePolicy, native_enum=False, length=32, values_callable=lambda x: [e.value for e in x]),
+        nullable=False,
+        default=MisfirePolicy.COALESCE,
+        server_default=MisfirePolicy.COALESCE.value,
+    )
     max_retries: Mapped[int] = mapped_column(Integer, nullable=False, default=3)
+    timeout_seconds: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Retry backoff: failed attempts push run_at forward by a delay from this policy
+    retry_policy: Mapped[RetryPolicy] = mapped_column(
+        Enum(RetryPolicy, native_enum=False, length=32, values_callable=lambda x: [e.value for e in x]),
+        nullable=False,
+        default=RetryPolicy.EXPONENTIAL_JITTER,
+        server_default=RetryPolicy.EXPONENTIAL_JITTER.value,
+    )
+    retry_delay_seconds: Mapped[int] = mapped_column(Integer, nullable=False, default=5, server_default="5")
+    retry_max_delay_seconds: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=600, server_default="600"
+    )
     status: Mapped[JobStatus] = mapped_column(
         Enum(JobStatus, values_callable=lambda x: [e.value for e in x]), nullable=False, default=JobStatus.SCHEDULED, index=True
     )
     retry_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Ownership while RUNNING: worker id and lease renewed by its heartbeat
+    locked_by: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -87,14 +161,22 @@ class Job(Base):
         nullable=False,
     )
     version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    # Lifetime totals, maintained when each execution finishes; survive execution retention pruning
+    run_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    success_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    failure_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    last_duration_seconds: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
 
     executions: Mapped[list["JobExecution"]] = relationship(
-        "JobExecution", back_populates="job", cascade="all, delete-orphan"
+        "JobExecution", back_populates="job", cascade="all, delete-orphan", passive_deletes=True
     )
 
 
 class JobExecution(Base):
     __tablename__ = "job_executions"
+    # Range-partitioned by started_at (migration 012; partitions managed by app.db.partitions),
+    # so the primary key has to include the partition key
+    __table_args__ = {"postgresql_partition_by": "RANGE (started_at)"}
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -104,7 +186,7 @@ class JobExecution(Base):
     )
     attempt_number: Mapped[int] = mapped_column(Integer, nullable=False)
     started_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False
     )
     finished_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True), nullable=True
@@ -114,5 +196,25 @@ class JobExecution(Base):
     )
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     result: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Backoff applied before the next attempt (null when no retry follows)
+    retry_delay_seconds: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
 
     job: Mapped["Job"] = relationship("Job", back_populates="executions")
+
+
+# Per-job history, newest first, keyset-paginated; also serves ON DELETE CASCADE from jobs
+Index(
+    "ix_job_executions_job_id_started_at",
+    JobExecution.job_id,
+    JobExecution.started_at.desc(),
+    JobExecution.id.desc(),
+)
+
+# create_all (init_db) on a fresh database: rows need a partition before maintenance creates ranged ones
+event.listen(
+    JobExecution.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS job_executions_default PARTITION OF job_executions DEFAULT").execute_if(
+        dialect="postgresql"
+    ),
+)
@@ -0,0 +1,33 @@
+"""Incrementally maintained counters behind GET /api/jobs/stats."""
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, SmallInteger, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class JobCounter(Base):
+    """
+    Number of jobs per (schedule_type, status), adjusted in the same transaction as every status change.
+    Each key is spread over a few shard rows so concurrent workers rarely wait on the same row lock;
+    readers sum the shards.
+    """
+
+    __tablename__ = "job_counters"
+
+    schedule_type: Mapped[str] = mapped_column(Text, primary_key=True)
+    status: Mapped[str] = mapped_column(Text, primary_key=True)
+    shard: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class ExecutionStatsBucket(Base):
+    """Finished executions per minute and outcome (sharded like JobCounter), for sliding-window success rates."""
+
+    __tablename__ = "execution_stats"
+
+    bucket: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    outcome: Mapped[str] = mapped_column(Text, primary_key=True)
+    shard: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
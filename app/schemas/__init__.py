@@ -1,13 +1,19 @@
 from app.schemas.job import (
+    BulkJobCreateResponse,
     JobCreate,
     JobResponse,
     JobExecutionResponse,
+    JobExecutionListResponse,
     JobListResponse,
+    JobStatsResponse,
 )
 
 __all__ = [
+    "BulkJobCreateResponse",
     "JobCreate",
     "JobResponse",
     "JobExecutionResponse",
+    "JobExecutionListResponse",
     "JobListResponse",
+    "JobStatsResponse",
 ]
@@ -5,16 +5,43 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field, field_validator, model_validator
 
-from app.models.job import JobStatus, ScheduleType
+from app.core.cron import get_timezone, parse_cron
+from app.core.job_types import check_job_payload, check_job_type, default_job_type
+from app.core.queues import DEFAULT_QUEUE, QUEUE_NAME_PATTERN
+from app.models.job import JobStatus, MisfirePolicy, RetryPolicy, ScheduleType
 
 
 class JobCreate(BaseModel):
     name: str = Field(..., min_length=1, max_length=500)
     payload: Optional[Dict[str, Any]] = None
+    job_type: Optional[str] = Field(
+        default=None,
+        min_length=1,
+        max_length=100,
+        description="Registered handler: webhook, shell, python, noop, demo, ... "
+        "(default: webhook if payload has a webhook_url, else demo)",
+    )
+    queue: str = Field(
+        default=DEFAULT_QUEUE, max_length=100, pattern=QUEUE_NAME_PATTERN, description="Claimed by workers subscribed to it"
+    )
+    priority: int = Field(default=0, ge=-1000, le=1000, description="Higher is claimed first within its queue")
     schedule_type: ScheduleType
     run_at: Optional[datetime] = None
     interval_seconds: Optional[int] = None
+    cron_expression: Optional[str] = Field(
+        default=None, max_length=200, description="5-field cron (minute hour day month weekday) or @daily etc."
+    )
+    cron_timezone: Optional[str] = Field(default=None, description="IANA timezone for cron_expression (default UTC)")
+    misfire_policy: MisfirePolicy = Field(
+        default=MisfirePolicy.COALESCE, description="Recurring jobs: coalesce, run_all or skip missed runs"
+    )
     max_retries: int = Field(default=3, ge=0, le=100)
+    timeout_seconds: Optional[int] = Field(
+        default=None, ge=1, le=86400, description="Execution deadline; worker default when omitted"
+    )
+    retry_policy: RetryPolicy = RetryPolicy.EXPONENTIAL_JITTER
+    retry_delay_seconds: int = Field(default=5, ge=0, le=86400, description="Base delay before a retry")
+    retry_max_delay_seconds: int = Field(default=600, ge=0, le=604800, description="Cap on the retry delay")
 
     @field_validator("run_at")
     @classmethod
@@ -27,6 +54,11 @@ class JobCreate(BaseModel):
             raise ValueError("run_at must be in the future")
         return v
 
+    @field_validator("job_type")
+    @classmethod
+    def job_type_registered(cls, v: Optional[str]) -> Optional[str]:
+        return v if v is None else check_job_type(v)
+
     @field_validator("interval_seconds")
     @classmethod
     def interval_positive(cls, v: Optional[int]) -> Optional[int]:
@@ -34,6 +66,26 @@ class JobCreate(BaseModel):
             raise ValueError("interval_seconds must be greater than 0")
         return v
 
+    @field_validator("cron_expression")
+    @classmethod
+    def cron_expression_valid(cls, v: Optional[str]) -> Optional[str]:
+        if v is None:
+            return v
+        v = " ".join(v.split())
+        try:
+            # Parsing also warms the cache the worker uses; next_after rejects expressions that never fire
+            parse_cron(v).next_after(datetime.now(timezone.utc).replace(tzinfo=None))
+        except ValueError as e:
+            raise ValueError(f"invalid cron_expression: {e}")
+        return v
+
+    @field_validator("cron_timezone")
+    @classmethod
+    def cron_timezone_valid(cls, v: Optional[str]) -> Optional[str]:
+        if v is not None:
+            get_timezone(v)
+        return v
+
     @model_validator(mode="after")
     def validate_schedule_fields(self) -> "JobCreate":
         if self.schedule_type == ScheduleType.ONE_TIME and self.run_at is None:
@@ -42,6 +94,18 @@ class JobCreate(BaseModel):
             raise ValueError("interval jobs require interval_seconds")
         if self.schedule_type == ScheduleType.ONE_TIME and self.interval_seconds is not None:
             raise ValueError("one_time jobs must not have interval_seconds")
+        if self.schedule_type == ScheduleType.CRON:
+            if self.cron_expression is None:
+                raise ValueError("cron jobs require cron_expression")
+            if self.interval_seconds is not None:
+                raise ValueError("cron jobs must not have interval_seconds")
+        elif self.cron_expression is not None or self.cron_timezone is not None:
+            raise ValueError("cron_expression / cron_timezone are only valid for cron jobs")
+        if self.retry_max_delay_seconds < self.retry_delay_seconds:
+            raise ValueError("retry_max_delay_seconds must be >= retry_delay_seconds")
+        if self.job_type is None:
+            self.job_type = default_job_type(self.payload)
+        check_job_payload(self.job_type, self.payload)
         return self
 
 
@@ -54,6 +118,7 @@ class JobExecutionResponse(BaseModel):
     status: str
     error_message: Optional[str]
     result: Optional[str] = None
+    retry_delay_seconds: Optional[float] = None
 
     model_config = {"from_attributes": True}
 
@@ -62,15 +127,29 @@ class JobResponse(BaseModel):
     id: UUID
     name: str
     payload: Optional[Dict[str, Any]]
+    job_type: str = "webhook"
+    queue: str = DEFAULT_QUEUE
+    priority: int = 0
     schedule_type: ScheduleType
     run_at: Optional[datetime]
     interval_seconds: Optional[int]
+    cron_expression: Optional[str] = None
+    cron_timezone: Optional[str] = None
+    misfire_policy: MisfirePolicy = MisfirePolicy.COALESCE
     max_retries: int
+    timeout_seconds: Optional[int] = None
+    retry_policy: RetryPolicy = RetryPolicy.EXPONENTIAL_JITTER
+    retry_delay_seconds: int = 5
+    retry_max_delay_seconds: int = 600
     status: JobStatus
     retry_count: int
     created_at: datetime
     updated_at: datetime
     version: int
+    run_count: int = 0
+    success_count: int = 0
+    failure_count: int = 0
+    last_duration_seconds: Optional[float] = None
     executions: List["JobExecutionResponse"] = []
 
     model_config = {"from_attributes": True}
@@ -82,4 +161,53 @@ class JobUpdate(BaseModel):
 
 class JobListResponse(BaseModel):
     jobs: List[JobResponse]
+    total: Optional[int] = Field(None, description="Exact or estimated count; null when count=none")
+    next_cursor: Optional[str] = Field(None, description="Pass as ?cursor= to fetch the next page; null on the last page")
+
+
+class BulkJobResult(BaseModel):
+    index: int = Field(..., description="Position among the submitted items (blank NDJSON lines are not counted)")
+    ok: bool
+    id: Optional[UUID] = None
+    errors: Optional[List[str]] = None
+
+
+class BulkJobCreateResponse(BaseModel):
+    total: int
+    created: int
+    failed: int
+    elapsed_ms: float
+    jobs_per_second: Optional[float] = None
+    truncated: bool = Field(default=False, description="Items past JOBS_BULK_MAX_ITEMS were not read")
+    results: List[BulkJobResult]
+
+
+class JobExecutionListResponse(BaseModel):
+    executions: List[JobExecutionResponse]
+    next_cursor: Optional[str] = None
+
+
+class QueueStats(BaseModel):
+    depth: int = Field(..., description="SCHEDULED jobs (due or future)")
+    running: int
+    oldest_due_at: Optional[datetime] = Field(None, description="run_at of the longest-waiting due job")
+    lag_seconds: float = Field(..., description="How long the oldest due job has been waiting (0 when none)")
+    next_run_at: Optional[datetime] = Field(None, description="Earliest future run_at when nothing is due")
+
+
+class ExecutionWindowStats(BaseModel):
+    success: int
+    failed: int
+    timeout: int
+    cancelled: int
+    total: int
+    success_rate: Optional[float] = Field(None, description="success / (success + failed + timeout); null without runs")
+
+
+class JobStatsResponse(BaseModel):
     total: int
+    by_status: Dict[str, int]
+    by_schedule_type: Dict[str, int]
+    queue: QueueStats
+    executions: Dict[str, ExecutionWindowStats] = Field(..., description="Keyed by window: 5m, 1h, 24h")
+    generated_at: datetime
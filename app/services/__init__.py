@@ -1,3 +1,3 @@
-from app.services.job_service import JobService
+from app.services.job_service import JobService, StaleJobError
 
-__all__ = ["JobService"]
+__all__ = ["JobService", "StaleJobError"]
@@ -0,0 +1,131 @@
+"""Bulk job import: decode a JSON array or NDJSON body, validate each item, insert in batches."""
+import json
+import time
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, NamedTuple, Optional
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.schemas.job import JobCreate
+from app.services.job_service import JobService
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/json-lines")
+
+
+class InvalidItem(NamedTuple):
+    """An item that could not be decoded (bad NDJSON line); reported in its slot of the results."""
+
+    message: str
+
+
+def is_ndjson(content_type: Optional[str]) -> bool:
+    return (content_type or "").split(";")[0].strip().lower() in NDJSON_CONTENT_TYPES
+
+
+def decode_json_array(body: bytes) -> list[Any]:
+    """Items of a JSON array body. Raises ValueError if the body is not one."""
+    try:
+        items = json.loads(body)
+    except ValueError as e:
+        raise ValueError(f"Body is not valid JSON: {e}")
+    if not isinstance(items, list):
+        raise ValueError("Body must be a JSON array of jobs (or NDJSON with Content-Type application/x-ndjson)")
+    return items
+
+
+async def iter_ndjson(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    """One decoded value per non-blank line, read as the body streams in; InvalidItem for lines that fail to parse."""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield _decode_line(line)
+    if buffer.strip():
+        yield _decode_line(buffer)
+
+
+def _decode_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return InvalidItem(f"invalid JSON: {e}")
+
+
+async def _aiter(items: Iterable[Any]) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
+
+
+def _error_messages(e: ValidationError) -> list[str]:
+    messages = []
+    for err in e.errors(include_url=False):
+        loc = ".".join(str(part) for part in err["loc"])
+        messages.append(f"{loc}: {err['msg']}" if loc else err["msg"])
+    return messages
+
+
+async def bulk_create_jobs(session: AsyncSession, items: Any, batch_size: Optional[int] = None) -> dict[str, Any]:
+    """
+    Validate each item with JobCreate and insert valid ones JOBS_BULK_BATCH_SIZE at a time, committing
+    per batch so one bad batch does not undo the rest. `items` is a list or an async iterator (NDJSON
+    is inserted while it is still being received). Returns per-item results in input order and throughput.
+    """
+    batch_size = max(1, batch_size or settings.JOBS_BULK_BATCH_SIZE)
+    service = JobService(session)
+    results: list[dict[str, Any]] = []
+    pending: list[tuple[int, JobCreate]] = []
+    started = time.perf_counter()
+
+    async def flush() -> None:
+        if not pending:
+            return
+        try:
+            ids = await service.create_many([data for _, data in pending])
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            for index, _ in pending:
+                results[index] = {"index": index, "ok": False, "errors": [f"insert failed: {e}"]}
+        else:
+            for (index, _), job_id in zip(pending, ids):
+                results[index] = {"index": index, "ok": True, "id": job_id}
+        pending.clear()
+
+    source = _aiter(items) if isinstance(items, list) else items
+    truncated = False
+    async for item in source:
+        index = len(results)
+        results.append({"index": index, "ok": False})
+        if index >= settings.JOBS_BULK_MAX_ITEMS:
+            # Stop reading: the rest of an oversized upload gets this one result, not one each
+            truncated = True
+            results[index]["errors"] = [
+                f"items from index {index} on were not read: exceeds JOBS_BULK_MAX_ITEMS ({settings.JOBS_BULK_MAX_ITEMS})"
+            ]
+            break
+        if isinstance(item, InvalidItem):
+            results[index]["errors"] = [item.message]
+            continue
+        try:
+            pending.append((index, JobCreate.model_validate(item)))
+        except ValidationError as e:
+            results[index]["errors"] = _error_messages(e)
+            continue
+        if len(pending) >= batch_size:
+            await flush()
+    await flush()
+
+    elapsed = time.perf_counter() - started
+    created = sum(1 for r in results if r["ok"])
+    return {
+        "total": len(results),
+        "created": created,
+        "failed": len(results) - created,
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "jobs_per_second": round(created / elapsed, 1) if elapsed > 0 else None,
+        "truncated": truncated,
+        "results": results,
+    }
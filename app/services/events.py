@@ -0,0 +1,144 @@
+"""
+Live job events: one LISTEN connection on job_events per API process, fanned out to in-memory
+subscriber queues that back the Server-Sent Events stream (GET /api/jobs/events).
+"""
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, NamedTuple, Optional
+
+from app.core.config import settings
+from app.db.notify import JOB_EVENTS_CHANNEL
+from app.db.session import connect_raw
+
+# Sent when a subscriber may have missed events (its queue overflowed, or LISTEN reconnected)
+RESYNC_EVENT = "resync"
+# Seconds between LISTEN reconnect attempts after a failure
+_RECONNECT_SECONDS = 5.0
+
+
+class JobEvent(NamedTuple):
+    event: str
+    job_id: Optional[str]
+    data: str  # JSON, forwarded to clients as-is
+
+
+def parse_event(payload: str) -> Optional[JobEvent]:
+    """JobEvent from a NOTIFY payload; None if it is not a JSON object with an "event" field."""
+    try:
+        body = json.loads(payload)
+    except ValueError:
+        return None
+    if not isinstance(body, dict) or not isinstance(body.get("event"), str):
+        return None
+    return JobEvent(body["event"], body.get("job_id"), payload)
+
+
+def resync_event() -> JobEvent:
+    return JobEvent(RESYNC_EVENT, None, json.dumps({"event": RESYNC_EVENT}))
+
+
+def format_sse(event: JobEvent) -> str:
+    """One Server-Sent Events message."""
+    return f"event: {event.event}\ndata: {event.data}\n\n"
+
+
+class JobEventBroker:
+    """
+    Subscribers get a bounded queue each. NOTIFY callbacks only do put_nowait, so one slow client
+    never blocks the connection or other clients: when its queue is full the backlog is dropped and
+    replaced by a single resync event (the client reloads instead of replaying every change).
+    """
+
+    def __init__(self, queue_size: int = 256) -> None:
+        self.queue_size = max(1, queue_size)
+        self._subscribers: set[asyncio.Queue[JobEvent]] = set()
+        self._conn: Any = None
+        self._lock = asyncio.Lock()
+        self._next_connect_attempt = 0.0
+
+    @property
+    def listening(self) -> bool:
+        return self._conn is not None and not self._conn.is_closed()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    async def ensure_listening(self) -> bool:
+        """Open the LISTEN connection if needed (rate limited after failures). Returns whether it is up."""
+        if self.listening:
+            return True
+        if time.monotonic() < self._next_connect_attempt:
+            return False
+        async with self._lock:
+            if self.listening:
+                return True
+            try:
+                conn = await connect_raw()
+                await conn.add_listener(JOB_EVENTS_CHANNEL, self._on_notify)
+                conn.add_termination_listener(self._on_terminated)
+            except Exception as e:
+                self._next_connect_attempt = time.monotonic() + _RECONNECT_SECONDS
+                print(f"LISTEN on '{JOB_EVENTS_CHANNEL}' unavailable: {e}", flush=True)
+                return False
+            reconnected = self._conn is not None
+            self._conn = conn
+            if reconnected:
+                # Anything sent while the connection was down is lost
+                self.publish(resync_event())
+            return True
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        event = parse_event(payload)
+        if event is not None:
+            self.publish(event)
+
+    def _on_terminated(self, connection: Any) -> None:
+        print(f"LISTEN connection on '{JOB_EVENTS_CHANNEL}' closed; reconnecting on next keepalive", flush=True)
+
+    def publish(self, event: JobEvent) -> None:
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(resync_event())
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[asyncio.Queue[JobEvent]]:
+        queue: asyncio.Queue[JobEvent] = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers.discard(queue)
+
+    async def stream(self, job_id: Optional[str] = None, keepalive_seconds: float = 15.0) -> AsyncIterator[str]:
+        """
+        SSE text for one client: events (optionally for a single job, plus resyncs), and a comment
+        line every `keepalive_seconds` so proxies keep the connection open. The keepalive also
+        re-establishes LISTEN if the connection dropped.
+        """
+        async with self.subscribe() as queue:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), keepalive_seconds)
+                except asyncio.TimeoutError:
+                    await self.ensure_listening()
+                    yield ": keepalive\n\n"
+                    continue
+                if job_id is not None and event.event != RESYNC_EVENT and event.job_id != job_id:
+                    continue
+                yield format_sse(event)
+
+    async def close(self) -> None:
+        if self.listening:
+            await self._conn.close()
+        self._conn = None
+
+
+job_events = JobEventBroker(queue_size=settings.EVENTS_SUBSCRIBER_QUEUE_SIZE)
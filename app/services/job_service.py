@@ -1,12 +1,26 @@
 """Job CRUD and business logic."""
-from typing import Optional
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Literal, Optional
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import delete, func, insert, select, text, true, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.models.job import Job, JobStatus, ScheduleType
+from app.db.notify import job_event, notify_job_events, notify_job_ready
+from app.models.job import Job, JobExecution, JobStatus, ScheduleType
 from app.schemas.job import JobCreate
+from app.services.scheduling import next_cron_run
+from app.services.stats import bulk_status_change, record_status_changes, status_change
+
+CountMode = Literal["exact", "estimate", "none"]
+
+
+class StaleJobError(Exception):
+    """The job's version changed between read and write (e.g. a worker finished it meanwhile)."""
 
 
 class JobService:
@@ -14,19 +28,64 @@ class JobService:
         self.session = session
 
     async def create(self, data: JobCreate) -> Job:
-        job = Job(
-            name=data.name,
-            payload=data.payload,
-            schedule_type=data.schedule_type,
-            run_at=data.run_at,
-            interval_seconds=data.interval_seconds,
-            max_retries=data.max_retries,
-        )
+        job = Job(**self._job_values(data))
         self.session.add(job)
         await self.session.flush()
         await self.session.refresh(job)
+        await record_status_changes(self.session, status_change(job.schedule_type, None, job.status))
+        await notify_job_ready(self.session, job.run_at)
+        await notify_job_events(
+            self.session,
+            [job_event("job_created", job.id, status=job.status.value, schedule_type=job.schedule_type.value, run_at=job.run_at)],
+        )
         return job
 
+    async def create_many(self, items: list[JobCreate]) -> list[UUID]:
+        """
+        Insert a batch of jobs with multi-row INSERTs (no per-job flush or refresh), one counter upsert,
+        one wakeup NOTIFY and one jobs_created event for the whole batch. Returns the new ids in input order.
+        """
+        if not items:
+            return []
+        rows = [{"id": uuid.uuid4(), "status": JobStatus.SCHEDULED, **self._job_values(data)} for data in items]
+        await self.session.execute(insert(Job), rows)
+        await record_status_changes(
+            self.session, bulk_status_change((r["schedule_type"] for r in rows), None, JobStatus.SCHEDULED)
+        )
+        await notify_job_ready(self.session, min(r["run_at"] for r in rows))
+        await notify_job_events(self.session, [job_event("jobs_created", None, count=len(rows))])
+        return [r["id"] for r in rows]
+
+    @classmethod
+    def _job_values(cls, data: JobCreate) -> dict[str, Any]:
+        return {
+            "name": data.name,
+            "payload": data.payload,
+            "job_type": data.job_type,
+            "queue": data.queue,
+            "priority": data.priority,
+            "schedule_type": data.schedule_type,
+            "run_at": cls._initial_run_at(data),
+            "interval_seconds": data.interval_seconds,
+            "cron_expression": data.cron_expression,
+            "cron_timezone": data.cron_timezone,
+            "misfire_policy": data.misfire_policy,
+            "max_retries": data.max_retries,
+            "timeout_seconds": data.timeout_seconds,
+            "retry_policy": data.retry_policy,
+            "retry_delay_seconds": data.retry_delay_seconds,
+            "retry_max_delay_seconds": data.retry_max_delay_seconds,
+        }
+
+    @staticmethod
+    def _initial_run_at(data: JobCreate) -> datetime:
+        """First run: cron jobs at their next fire time (after run_at if given); others at run_at or now.
+        A non-null run_at keeps every job in the claim index."""
+        now = datetime.now(timezone.utc)
+        if data.schedule_type == ScheduleType.CRON and data.cron_expression:
+            return next_cron_run(data.cron_expression, data.cron_timezone, data.run_at or now)
+        return data.run_at or now
+
     async def get_by_id(self, job_id: UUID) -> Optional[Job]:
         result = await self.session.execute(
             select(Job).where(Job.id == job_id)
@@ -39,34 +98,167 @@ class JobService:
         schedule_type: Optional[ScheduleType] = None,
         limit: int = 100,
         offset: int = 0,
-    ) -> tuple[list[Job], int]:
-        q = select(Job)
-        count_q = select(func.count()).select_from(Job)
+        cursor: Optional[tuple[datetime, UUID]] = None,
+        count: CountMode = "exact",
+    ) -> tuple[list[Job], Optional[int], Optional[tuple[datetime, UUID]]]:
+        """
+        Newest-first page of jobs. With `cursor` (the (created_at, id) of the previous page's last row)
+        the page is found by index seek instead of OFFSET. Returns (jobs, total, next_cursor);
+        total is exact, a planner estimate, or None depending on `count`.
+        """
+        filters = []
         if status is not None:
-            q = q.where(Job.status == status)
-            count_q = count_q.where(Job.status == status)
+            filters.append(Job.status == status)
         if schedule_type is not None:
-            q = q.where(Job.schedule_type == schedule_type)
-            count_q = count_q.where(Job.schedule_type == schedule_type)
-        total_count = (await self.session.execute(count_q)).scalar_one()
-        q = q.order_by(Job.created_at.desc()).limit(limit).offset(offset)
+            filters.append(Job.schedule_type == schedule_type)
+
+        q = select(Job).where(*filters)
+        if cursor is not None:
+            q = q.where(tuple_(Job.created_at, Job.id) < tuple_(*cursor))
+        else:
+            q = q.offset(offset)
+        q = q.order_by(Job.created_at.desc(), Job.id.desc()).limit(limit + 1)
         result = await self.session.execute(q)
         jobs = list(result.scalars().all())
-        return jobs, total_count
 
-    async def update_status(self, job_id: UUID, new_status: JobStatus) -> Optional[Job]:
+        next_cursor = None
+        if len(jobs) > limit:
+            jobs = jobs[:limit]
+            next_cursor = (jobs[-1].created_at, jobs[-1].id)
+
+        total: Optional[int] = None
+        if count == "exact":
+            count_q = select(func.count()).select_from(Job).where(*filters)
+            total = (await self.session.execute(count_q)).scalar_one()
+        elif count == "estimate":
+            total = await self._estimate_count(filters)
+        return jobs, total, next_cursor
+
+    async def _estimate_count(self, filters: list) -> int:
+        """
+        Row count without scanning: pg_class.reltuples for the whole table, the planner's
+        row estimate for filtered queries. Falls back to an exact count if the table was never analyzed.
+        """
+        if not filters:
+            estimate = (
+                await self.session.execute(
+                    text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'jobs'::regclass")
+                )
+            ).scalar_one_or_none()
+        else:
+            stmt = select(Job.id).where(*filters)
+            sql = str(stmt.compile(dialect=self.session.bind.dialect, compile_kwargs={"literal_binds": True}))
+            plan = (await self.session.execute(text("EXPLAIN (FORMAT JSON) " + sql))).scalar_one()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = plan[0]["Plan"]["Plan Rows"]
+        if estimate is None or estimate < 0:
+            count_q = select(func.count()).select_from(Job).where(*filters)
+            return (await self.session.execute(count_q)).scalar_one()
+        return int(estimate)
+
+    async def list_executions(
+        self,
+        job_id: UUID,
+        limit: int = 50,
+        cursor: Optional[tuple[datetime, UUID]] = None,
+    ) -> tuple[list[JobExecution], Optional[tuple[datetime, UUID]]]:
+        """Newest-first page of one job's executions, keyset-paginated on (started_at, id)."""
+        q = select(JobExecution).where(JobExecution.job_id == job_id)
+        if cursor is not None:
+            q = q.where(tuple_(JobExecution.started_at, JobExecution.id) < tuple_(*cursor))
+        q = q.order_by(JobExecution.started_at.desc(), JobExecution.id.desc()).limit(limit + 1)
+        result = await self.session.execute(q)
+        executions = list(result.scalars().all())
+        next_cursor = None
+        if len(executions) > limit:
+            executions = executions[:limit]
+            next_cursor = (executions[-1].started_at, executions[-1].id)
+        return executions, next_cursor
+
+    async def load_recent_executions(self, jobs: list[Job], per_job: Optional[int]) -> None:
+        """
+        Attach executions to `jobs` with one query instead of one refresh per job.
+        Keeps only the latest `per_job` per job: a LATERAL top-N per job on ix_job_executions_job_id_started_at,
+        so the cost is about len(jobs) * per_job however long each job's history is. None loads all, 0 loads none.
+        Executions are ordered oldest first, like the relationship.
+        """
+        if not jobs:
+            return
+        by_job: dict[UUID, list[JobExecution]] = {j.id: [] for j in jobs}
+        if per_job != 0:
+            if per_job is None:
+                q = select(JobExecution).where(JobExecution.job_id.in_(list(by_job)))
+                ordered = q.order_by(JobExecution.job_id, JobExecution.started_at, JobExecution.id)
+            else:
+                page = select(Job.id).where(Job.id.in_(list(by_job))).subquery("page")
+                latest = (
+                    select(JobExecution)
+                    .where(JobExecution.job_id == page.c.id)
+                    .order_by(JobExecution.started_at.desc(), JobExecution.id.desc())
+                    .limit(per_job)
+                    .lateral("latest")
+                )
+                recent = aliased(JobExecution, latest)
+                ordered = (
+                    select(recent)
+                    .select_from(page)
+                    .join(latest, true())
+                    .order_by(recent.job_id, recent.started_at, recent.id)
+                )
+            result = await self.session.execute(ordered)
+            for execution in result.scalars():
+                by_job[execution.job_id].append(execution)
+        for job in jobs:
+            set_committed_value(job, "executions", by_job[job.id])
+
+    async def update_status(
+        self, job_id: UUID, new_status: JobStatus, expected_version: Optional[int] = None
+    ) -> Optional[Job]:
+        """
+        Set status with optimistic concurrency: the write only applies if `version` is still the one
+        read (`expected_version`, or the current row's), and bumps it. A worker finishing the job
+        concurrently then sees the bump and leaves the new status alone.
+        Raises StaleJobError if the job changed in between.
+        """
         job = await self.get_by_id(job_id)
         if job is None:
             return None
-        job.status = new_status
-        await self.session.flush()
+        version = job.version if expected_version is None else expected_version
+        values: dict[str, Any] = {"status": new_status, "version": Job.version + 1}
+        if job.status == JobStatus.RUNNING and new_status != JobStatus.RUNNING:
+            # Release the lease too: the owner's next renewal fails and aborts the run
+            values.update(locked_by=None, lease_expires_at=None)
+        result = await self.session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.version == version)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            raise StaleJobError(f"Job {job_id} was modified concurrently")
+        # The version matched, so the row still had the status read above
+        await record_status_changes(self.session, status_change(job.schedule_type, job.status, new_status))
         await self.session.refresh(job)
+        await notify_job_events(
+            self.session, [job_event("job_status", job.id, status=new_status.value, run_at=job.run_at, version=job.version)]
+        )
+        if new_status == JobStatus.SCHEDULED:
+            # Resume: wake workers instead of waiting for their next poll
+            await notify_job_ready(self.session, job.run_at)
         return job
 
     async def delete(self, job_id: UUID) -> bool:
-        job = await self.get_by_id(job_id)
-        if job is None:
+        """Delete the job; its executions go with it through ON DELETE CASCADE (no ORM load of the history)."""
+        result = await self.session.execute(
+            delete(Job)
+            .where(Job.id == job_id)
+            .returning(Job.schedule_type, Job.status)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.one_or_none()
+        if row is None:
             return False
-        await self.session.delete(job)
-        await self.session.flush()
+        await record_status_changes(self.session, status_change(row.schedule_type, row.status, None))
+        await notify_job_events(self.session, [job_event("job_deleted", job_id)])
         return True
@@ -0,0 +1,20 @@
+"""Opaque keyset cursors: (timestamp, id) of the last row on a page, newest-first ordering."""
+import base64
+import binascii
+from datetime import datetime
+from uuid import UUID
+
+
+def encode_cursor(ts: datetime, row_id: UUID) -> str:
+    raw = f"{ts.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Inverse of encode_cursor. Raises ValueError for malformed cursors."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        ts, row_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(ts), UUID(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
@@ -0,0 +1,109 @@
+"""Execution history retention: prune old job_executions rows in small batches."""
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.session import async_session_factory
+
+# pg_try_advisory_xact_lock key, so only one process prunes at a time
+_RETENTION_LOCK_KEY = 7_231_015
+# Jobs visited per pass of the prune query; keeps each statement's lateral probes bounded
+_JOBS_PER_CHUNK = 200
+
+# For each job in the chunk: skip its newest :keep executions (index scan on
+# ix_job_executions_job_id_started_at), then take finished ones older than :cutoff.
+_PRUNE_SQL = text("""
+    WITH chunk AS (
+        SELECT id FROM jobs WHERE id > CAST(:after AS uuid) ORDER BY id LIMIT :chunk
+    ), doomed AS (
+        SELECT old.id, old.started_at
+        FROM chunk
+        CROSS JOIN LATERAL (
+            SELECT e.id, e.started_at, e.finished_at
+            FROM job_executions e
+            WHERE e.job_id = chunk.id
+            ORDER BY e.started_at DESC, e.id DESC
+            OFFSET :keep
+        ) AS old
+        WHERE old.finished_at IS NOT NULL AND old.started_at < :cutoff
+        LIMIT :batch
+    )
+    DELETE FROM job_executions WHERE (id, started_at) IN (SELECT id, started_at FROM doomed)
+""")
+
+
+def retention_enabled() -> bool:
+    return settings.EXECUTION_RETENTION_KEEP_LAST > 0 or settings.EXECUTION_RETENTION_TTL_HOURS > 0
+
+
+def _cutoff() -> datetime:
+    """Executions started before this are old enough to delete (far future when there is no TTL)."""
+    if settings.EXECUTION_RETENTION_TTL_HOURS > 0:
+        return datetime.now(timezone.utc) - timedelta(hours=settings.EXECUTION_RETENTION_TTL_HOURS)
+    return datetime.now(timezone.utc) + timedelta(days=1)
+
+
+async def _prune_chunk(after: str, keep: int, cutoff: datetime, batch: int) -> Optional[int]:
+    """Delete up to `batch` rows for the jobs after `after`. None if another process holds the retention lock."""
+    async with async_session_factory() as session:
+        try:
+            locked = (
+                await session.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _RETENTION_LOCK_KEY})
+            ).scalar_one()
+            if not locked:
+                await session.rollback()
+                return None
+            result = await session.execute(
+                _PRUNE_SQL,
+                {"after": after, "chunk": _JOBS_PER_CHUNK, "keep": keep, "cutoff": cutoff, "batch": batch},
+            )
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+    return result.rowcount or 0
+
+
+async def _next_chunk_start(after: str) -> Optional[str]:
+    """Last job id of the chunk after `after`, i.e. where the following chunk starts; None past the end."""
+    async with async_session_factory() as session:
+        result = await session.execute(
+            text("SELECT id::text FROM jobs WHERE id > CAST(:after AS uuid) ORDER BY id OFFSET :skip LIMIT 1"),
+            {"after": after, "skip": _JOBS_PER_CHUNK - 1},
+        )
+        return result.scalar_one_or_none()
+
+
+async def prune_executions(deadline: Optional[float] = None) -> int:
+    """
+    One retention pass over all jobs. An execution is kept if it is among its job's newest
+    EXECUTION_RETENTION_KEEP_LAST or younger than EXECUTION_RETENTION_TTL_HOURS (each 0 = off);
+    unfinished executions are never deleted. Per-job totals live on the job row (run_count, ...)
+    and are not affected. Each batch is its own short transaction of at most
+    EXECUTION_RETENTION_BATCH_SIZE rows. Stops early at `deadline` (time.monotonic()).
+    Returns the number of rows deleted.
+    """
+    if not retention_enabled():
+        return 0
+    keep = max(0, settings.EXECUTION_RETENTION_KEEP_LAST)
+    batch = max(1, settings.EXECUTION_RETENTION_BATCH_SIZE)
+    cutoff = _cutoff()
+    after = "00000000-0000-0000-0000-000000000000"
+    deleted = 0
+    while deadline is None or time.monotonic() < deadline:
+        n = await _prune_chunk(after, keep, cutoff, batch)
+        if n is None:
+            break  # another process is pruning
+        deleted += n
+        if n < batch:
+            nxt = await _next_chunk_start(after)
+            if nxt is None:
+                break
+            after = nxt
+        # Yield between batches so job execution is not starved
+        await asyncio.sleep(settings.EXECUTION_RETENTION_PAUSE_SECONDS)
+    return deleted
@@ -0,0 +1,103 @@
+"""Scheduling math: when a job should run next (retry backoff, cron fire times, misfire handling)."""
+import random
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from app.core.cron import get_timezone, parse_cron
+from app.models.job import MisfirePolicy, RetryPolicy
+
+# run_all on a cron job enumerates missed fire times; past this many it coalesces instead
+_MAX_CRON_CATCHUP_SCAN = 10_000
+
+
+def next_cron_run(expression: str, timezone_name: Optional[str], after: datetime) -> datetime:
+    """
+    Next fire time (UTC) strictly after `after`, evaluating the expression in wall-clock time of
+    `timezone_name`. The parsed expression comes from parse_cron's cache.
+    """
+    tz = get_timezone(timezone_name)
+    schedule = parse_cron(expression)
+    local = after.astimezone(tz).replace(tzinfo=None)
+    while True:
+        candidate = schedule.next_after(local)
+        fire = candidate.replace(tzinfo=tz).astimezone(timezone.utc)
+        # Around DST transitions a wall-clock minute can map to or before `after`; keep searching
+        if fire > after:
+            return fire
+        local = candidate
+
+
+def _interval_slot_after(anchor: datetime, step: timedelta, t: datetime) -> datetime:
+    """First slot of the grid anchor + k*step strictly after `t`."""
+    if t < anchor:
+        return anchor + step
+    return anchor + step * ((t - anchor) // step + 1)
+
+
+def next_interval_run(
+    anchor: datetime,
+    interval_seconds: int,
+    started: datetime,
+    now: datetime,
+    policy: MisfirePolicy,
+    max_catchup: int,
+) -> datetime:
+    """
+    Next run_at of an interval job whose run scheduled for `anchor` started at `started` and
+    finished at `now`. Runs stay on the grid anchor + k*interval, so execution time and poll lag
+    never accumulate into drift.
+    coalesce: slots that came due before the run started are covered by it; slots that came due
+    while it ran collapse into one immediate run. skip: the next slot after now.
+    run_all: every missed slot, oldest first, keeping at most `max_catchup` of them.
+    """
+    step = timedelta(seconds=interval_seconds)
+    if policy == MisfirePolicy.RUN_ALL:
+        missed = (now - anchor) // step if now > anchor else 0
+        if missed > max_catchup:
+            return anchor + step * (missed - max_catchup + 1)
+        return anchor + step
+    return _interval_slot_after(anchor, step, started if policy == MisfirePolicy.COALESCE else now)
+
+
+def next_cron_run_after_misfire(
+    expression: str,
+    timezone_name: Optional[str],
+    anchor: datetime,
+    started: datetime,
+    now: datetime,
+    policy: MisfirePolicy,
+    max_catchup: int,
+) -> datetime:
+    """Cron counterpart of next_interval_run: the grid is the expression's fire times."""
+    if policy == MisfirePolicy.RUN_ALL:
+        pending: deque[datetime] = deque(maxlen=max_catchup)
+        fire = anchor
+        for _ in range(_MAX_CRON_CATCHUP_SCAN):
+            fire = next_cron_run(expression, timezone_name, fire)
+            if fire > now:
+                return pending[0] if pending else fire
+            pending.append(fire)
+        policy = MisfirePolicy.COALESCE
+    return next_cron_run(expression, timezone_name, started if policy == MisfirePolicy.COALESCE else now)
+
+
+def compute_retry_delay(
+    policy: RetryPolicy,
+    base_seconds: float,
+    max_seconds: float,
+    attempt: int,
+    rand: Callable[[], float] = random.random,
+) -> float:
+    """
+    Seconds to wait before retrying after failed attempt number `attempt` (1-based).
+    fixed: base. exponential: base * 2^(attempt-1), capped at max.
+    exponential_jitter: "full jitter", uniform in [0, capped exponential], which spreads retries of
+    many jobs failing against the same receiver instead of retrying them in lockstep.
+    """
+    if policy == RetryPolicy.FIXED:
+        return min(base_seconds, max_seconds)
+    capped = min(max_seconds, base_seconds * (2 ** max(0, attempt - 1)))
+    if policy == RetryPolicy.EXPONENTIAL_JITTER:
+        return rand() * capped
+    return capped
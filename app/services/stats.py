@@ -0,0 +1,215 @@
+"""
+Job and execution counters: every status change upserts a delta in the same transaction, so
+GET /api/jobs/stats reads a handful of rows instead of running count(*) over jobs / job_executions.
+"""
+import enum
+import random
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Mapping, Optional, Union
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.job import ExecutionStatus, Job, JobStatus, ScheduleType
+from app.models.stats import ExecutionStatsBucket, JobCounter
+
+StatusKey = tuple[Union[ScheduleType, str], Union[JobStatus, str]]
+
+# pg_try_advisory_xact_lock key, so only one process reconciles at a time
+_RECONCILE_LOCK_KEY = 7_231_017
+
+# Actual count minus counter sum per (schedule_type, status), in one statement (one snapshot)
+_COUNTER_DRIFT_SQL = text("""
+    WITH actual AS (
+        SELECT schedule_type::text AS schedule_type, status::text AS status, count(*) AS n FROM jobs GROUP BY 1, 2
+    ), counted AS (
+        SELECT schedule_type, status, sum(count) AS n FROM job_counters GROUP BY 1, 2
+    )
+    SELECT coalesce(a.schedule_type, c.schedule_type) AS schedule_type,
+           coalesce(a.status, c.status) AS status,
+           coalesce(a.n, 0) - coalesce(c.n, 0) AS drift
+    FROM actual a
+    FULL JOIN counted c ON c.schedule_type = a.schedule_type AND c.status = a.status
+    WHERE coalesce(a.n, 0) <> coalesce(c.n, 0)
+""")
+
+# Sliding windows for execution success rates (minute buckets, so a window may include part of one extra minute)
+STATS_WINDOWS = {"5m": timedelta(minutes=5), "1h": timedelta(hours=1), "24h": timedelta(hours=24)}
+
+
+def _value(v: Any) -> str:
+    return v.value if isinstance(v, enum.Enum) else str(v)
+
+
+def _is_postgres(session: AsyncSession) -> bool:
+    return session.bind.dialect.name == "postgresql"
+
+
+def status_change(
+    schedule_type: Union[ScheduleType, str],
+    old: Optional[JobStatus],
+    new: Optional[JobStatus],
+    n: int = 1,
+) -> Counter[StatusKey]:
+    """Counter deltas for `n` jobs moving from `old` to `new` (None = created / deleted)."""
+    deltas: Counter[StatusKey] = Counter()
+    if old == new or n == 0:
+        return deltas
+    if old is not None:
+        deltas[(schedule_type, old)] -= n
+    if new is not None:
+        deltas[(schedule_type, new)] += n
+    return deltas
+
+
+def bulk_status_change(
+    schedule_types: Iterable[Union[ScheduleType, str]], old: Optional[JobStatus], new: Optional[JobStatus]
+) -> Counter[StatusKey]:
+    """Deltas for a batch of jobs (one schedule type per job) all moving from `old` to `new`."""
+    deltas: Counter[StatusKey] = Counter()
+    for schedule_type, n in Counter(schedule_types).items():
+        # update() keeps negative counts; Counter addition would drop them
+        deltas.update(status_change(schedule_type, old, new, n))
+    return deltas
+
+
+async def record_status_changes(session: AsyncSession, deltas: Mapping[StatusKey, int]) -> None:
+    """
+    Apply counter deltas in the caller's transaction: one multi-row INSERT ... ON CONFLICT into a
+    random shard. Keys are sorted so concurrent transactions lock counter rows in the same order.
+    """
+    if not _is_postgres(session):
+        return
+    rows = sorted(((_value(st), _value(status)), n) for (st, status), n in deltas.items() if n)
+    if not rows:
+        return
+    shard = random.randrange(max(1, settings.STATS_COUNTER_SHARDS))
+    stmt = pg_insert(JobCounter).values(
+        [{"schedule_type": st, "status": status, "shard": shard, "count": n} for (st, status), n in rows]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[JobCounter.schedule_type, JobCounter.status, JobCounter.shard],
+        set_={"count": JobCounter.count + stmt.excluded["count"]},
+    )
+    await session.execute(stmt)
+
+
+async def record_execution(session: AsyncSession, outcome: ExecutionStatus) -> None:
+    """Count one finished execution in the current minute's bucket."""
+    if not _is_postgres(session):
+        return
+    stmt = pg_insert(ExecutionStatsBucket).values(
+        bucket=func.date_trunc("minute", func.now()),
+        outcome=outcome.value,
+        shard=random.randrange(max(1, settings.STATS_COUNTER_SHARDS)),
+        count=1,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ExecutionStatsBucket.bucket, ExecutionStatsBucket.outcome, ExecutionStatsBucket.shard],
+        set_={"count": ExecutionStatsBucket.count + 1},
+    )
+    await session.execute(stmt)
+
+
+async def get_job_stats(session: AsyncSession) -> dict[str, Any]:
+    """Counts per status / schedule type, queue depth and lag, and execution outcomes per window."""
+    now = datetime.now(timezone.utc)
+    by_status = {s.value: 0 for s in JobStatus}
+    by_schedule_type = {t.value: 0 for t in ScheduleType}
+    counters = await session.execute(
+        select(JobCounter.schedule_type, JobCounter.status, func.sum(JobCounter.count)).group_by(
+            JobCounter.schedule_type, JobCounter.status
+        )
+    )
+    for schedule_type, status, count in counters:
+        by_status[status] = by_status.get(status, 0) + int(count)
+        by_schedule_type[schedule_type] = by_schedule_type.get(schedule_type, 0) + int(count)
+
+    # min(run_at) over the partial index ix_jobs_scheduled_run_at: one index probe
+    earliest = (
+        await session.execute(select(func.min(Job.run_at)).where(Job.status == JobStatus.SCHEDULED))
+    ).scalar_one_or_none()
+    oldest_due = earliest if earliest is not None and earliest <= now else None
+
+    window_columns = [
+        func.coalesce(
+            func.sum(ExecutionStatsBucket.count).filter(
+                ExecutionStatsBucket.bucket >= func.date_trunc("minute", func.now() - window)
+            ),
+            0,
+        ).label(name)
+        for name, window in STATS_WINDOWS.items()
+    ]
+    longest = max(STATS_WINDOWS.values())
+    outcome_rows = await session.execute(
+        select(ExecutionStatsBucket.outcome, *window_columns)
+        .where(ExecutionStatsBucket.bucket >= func.date_trunc("minute", func.now() - longest))
+        .group_by(ExecutionStatsBucket.outcome)
+    )
+    per_window: dict[str, dict[str, int]] = {name: {} for name in STATS_WINDOWS}
+    for row in outcome_rows:
+        for name in STATS_WINDOWS:
+            per_window[name][row.outcome] = int(row._mapping[name])
+
+    executions = {}
+    for name, outcomes in per_window.items():
+        success = outcomes.get(ExecutionStatus.SUCCESS.value, 0)
+        failed = outcomes.get(ExecutionStatus.FAILED.value, 0)
+        timeout = outcomes.get(ExecutionStatus.TIMEOUT.value, 0)
+        cancelled = outcomes.get(ExecutionStatus.CANCELLED.value, 0)
+        decided = success + failed + timeout
+        executions[name] = {
+            "success": success,
+            "failed": failed,
+            "timeout": timeout,
+            "cancelled": cancelled,
+            "total": decided + cancelled,
+            "success_rate": round(success / decided, 4) if decided else None,
+        }
+
+    return {
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "by_schedule_type": by_schedule_type,
+        "queue": {
+            "depth": by_status[JobStatus.SCHEDULED.value],
+            "running": by_status[JobStatus.RUNNING.value],
+            "oldest_due_at": oldest_due,
+            "lag_seconds": round((now - oldest_due).total_seconds(), 3) if oldest_due else 0.0,
+            "next_run_at": earliest if earliest is not None and earliest > now else None,
+        },
+        "executions": executions,
+        "generated_at": now,
+    }
+
+
+async def reconcile_job_counters(session: AsyncSession) -> Optional[int]:
+    """
+    Safety net against drift (rows written outside the app, e.g. by hand or by benchmarks): recount jobs
+    and upsert the difference as one more delta. Count and counters are read in one statement, so one
+    snapshot, in which every app transaction shows both its job change and its delta or neither. The
+    correction therefore commutes with status changes committed meanwhile: nothing is locked but the
+    advisory key, and claims, finalizes and PATCHes keep running during the scan.
+    Returns the number of keys corrected, or None when another process holds the lock (or not Postgres).
+    """
+    if not _is_postgres(session):
+        return None
+    locked = (
+        await session.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _RECONCILE_LOCK_KEY})
+    ).scalar_one()
+    if not locked:
+        return None
+    drift = await session.execute(_COUNTER_DRIFT_SQL)
+    deltas: Counter[StatusKey] = Counter({(r.schedule_type, r.status): int(r.drift) for r in drift})
+    await record_status_changes(session, deltas)
+    return len(deltas)
+
+
+async def prune_execution_stats(session: AsyncSession) -> int:
+    """Delete minute buckets older than the longest window."""
+    cutoff = datetime.now(timezone.utc) - max(STATS_WINDOWS.values()) - timedelta(hours=1)
+    result = await session.execute(delete(ExecutionStatsBucket).where(ExecutionStatsBucket.bucket < cutoff))
+    return result.rowcount or 0
@@ -0,0 +1,86 @@
+"""
+CPU lane: worker processes for kind="cpu" handlers, so heavy jobs do not block the event loop that
+claims jobs, renews leases and runs every other in-flight job.
+
+The lane is WORKER_CPU_PROCESSES single-process executors rather than one shared pool, so a job that
+times out or is cancelled can have its own process killed and replaced without touching the others:
+a hung computation never keeps holding a slot.
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+
+# Idle executors; a job takes one for its whole run and puts it (or its replacement) back
+_idle: Optional[asyncio.Queue[ProcessPoolExecutor]] = None
+_executors: set[ProcessPoolExecutor] = set()
+
+
+def cpu_lane_enabled() -> bool:
+    return settings.WORKER_CPU_PROCESSES > 0
+
+
+def _new_executor() -> ProcessPoolExecutor:
+    """One lane slot. Its process is spawned, not forked, on first use: the parent has live asyncpg
+    connections and threads (heartbeat, health server) that must not be copied."""
+    executor = ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=multiprocessing.get_context("spawn"),
+        max_tasks_per_child=settings.WORKER_CPU_MAX_TASKS_PER_CHILD or None,
+    )
+    _executors.add(executor)
+    return executor
+
+
+def _kill(executor: ProcessPoolExecutor) -> None:
+    """Stop an executor's process now, even mid-task (ProcessPoolExecutor has no public way before 3.14)."""
+    if executor not in _executors:
+        return  # already killed (lane closed while its job ran)
+    _executors.discard(executor)
+    terminate = getattr(executor, "terminate_workers", None)
+    if terminate is not None:
+        terminate()
+        return
+    for process in list((getattr(executor, "_processes", None) or {}).values()):
+        process.kill()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _lane() -> asyncio.Queue[ProcessPoolExecutor]:
+    global _idle
+    if _idle is None:
+        _idle = asyncio.Queue()
+        for _ in range(max(1, settings.WORKER_CPU_PROCESSES)):
+            _idle.put_nowait(_new_executor())
+    return _idle
+
+
+async def run_in_cpu_pool(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a picklable top-level `func(*args)` in a free lane process (waiting for one if all are busy).
+    If the process dies (segfault, OOM kill) BrokenProcessPool is raised. If the caller gives up
+    (timeout, job cancelled, shutdown) the process is killed. Either way the slot gets a fresh process.
+    """
+    lane = _lane()
+    executor = await lane.get()
+    replace = True
+    try:
+        result = await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+        replace = False
+        return result
+    finally:
+        if replace:
+            _kill(executor)
+        # A closed lane has already killed every executor, this one included
+        if lane is _idle:
+            lane.put_nowait(_new_executor() if replace else executor)
+
+
+async def close_cpu_pool() -> None:
+    """Kill every lane process on shutdown, busy or not, so a hung computation cannot hold up the exit."""
+    global _idle
+    _idle = None
+    for executor in list(_executors):
+        _kill(executor)
@@ -0,0 +1,265 @@
+"""
+Job handlers: what a job does when it runs, chosen by its job_type.
+
+Built-ins: webhook (POST to payload.webhook_url), shell (payload.command), python and python_cpu
+(payload.callable, an import path), noop, and demo (random sleep + quote fetch, for trying the
+scheduler out). shell and python* run arbitrary code and are off unless enabled in settings;
+python* also need an explicit WORKER_PYTHON_HANDLER_MODULES allowlist.
+
+The registry itself is app.core.job_types (the API validates job_type against it without importing
+the worker). Register your own with the decorator, in a module listed in JOB_HANDLER_MODULES:
+
+    @register_handler("send_digest")
+    async def send_digest(ctx: JobContext) -> HandlerResult:
+        ...
+
+    @register_handler("render_report", kind="cpu")
+    def render_report(job_id: str, payload: dict) -> HandlerResult:
+        ...
+        return True, "done"
+
+kind="io" handlers are coroutines run on the worker's event loop with the full JobContext.
+kind="cpu" handlers are plain module-level functions run in the CPU lane (worker processes, see
+app.worker.cpu) so they do not stall claiming, heartbeats or other jobs. Only the job type, id and
+payload are sent to the child process, which looks the handler up in its own registry.
+"""
+import asyncio
+import importlib
+import inspect
+import random
+import shlex
+import time
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.job_types import (  # noqa: F401 (registry API re-exported for handler modules)
+    HandlerResult,
+    JobContext,
+    JobHandler,
+    get_handler,
+    register_handler,
+    registered_handlers,
+)
+from app.worker.cpu import cpu_lane_enabled, run_in_cpu_pool
+from app.worker.http import get_http_client, host_slot
+
+# Longest command output / callable result kept in JobExecution.result
+MAX_RESULT_CHARS = 4000
+
+
+def _truncate(text: str) -> str:
+    return text if len(text) <= MAX_RESULT_CHARS else "…" + text[-MAX_RESULT_CHARS:]
+
+
+def _is_webhook_url(url: str) -> bool:
+    """True if this looks like a valid HTTP(S) URL for webhook."""
+    u = (url or "").strip()
+    return bool(u and isinstance(u, str) and (u.startswith("http://") or u.startswith("https://")))
+
+
+def _webhook_url(payload: dict[str, Any]) -> str:
+    return str(payload.get("webhook_url") or payload.get("callback_url") or "").strip()
+
+
+def _check_webhook_payload(payload: dict[str, Any]) -> None:
+    if not _is_webhook_url(_webhook_url(payload)):
+        raise ValueError("webhook jobs require payload.webhook_url (or callback_url), an http(s) URL")
+
+
+@register_handler("webhook", validate=_check_webhook_payload)
+async def webhook_handler(ctx: JobContext) -> HandlerResult:
+    """POST job details to payload.webhook_url (or callback_url); 2xx is success."""
+    url = _webhook_url(ctx.payload)
+    if not _is_webhook_url(url):
+        return False, "payload.webhook_url must be an http(s) URL"
+    body = {
+        "job_id": ctx.job_id,
+        "job_name": ctx.name,
+        "run_at": datetime.now(timezone.utc).isoformat(),
+        "schedule_type": ctx.schedule_type,
+        "attempt": ctx.attempt,
+    }
+    sent = time.perf_counter()
+    try:
+        async with host_slot(url):
+            r = await get_http_client().post(url, json=body)
+        metrics.WEBHOOK_SECONDS.labels(metrics.status_class(r.status_code)).observe(time.perf_counter() - sent)
+        if 200 <= r.status_code < 300:
+            return True, f"Webhook delivered to {url[:50]}... (HTTP {r.status_code})"
+        return False, f"Webhook failed: HTTP {r.status_code}"
+    except Exception as e:
+        metrics.WEBHOOK_SECONDS.labels("error").observe(time.perf_counter() - sent)
+        return False, f"Webhook failed: {e}"
+
+
+@register_handler("noop")
+async def noop_handler(ctx: JobContext) -> HandlerResult:
+    return True, None
+
+
+def _shell_argv(payload: dict[str, Any]) -> Optional[list[Any]]:
+    """payload.command as argv (a string is split with shlex), or None if it is missing or not a list."""
+    command = payload.get("command")
+    argv = shlex.split(command) if isinstance(command, str) else command
+    return argv if argv and isinstance(argv, list) else None
+
+
+def _check_shell_payload(payload: dict[str, Any]) -> None:
+    if _shell_argv(payload) is None:
+        raise ValueError("shell jobs require payload.command, a non-empty string or list")
+
+
+@register_handler("shell", enabled=lambda: settings.WORKER_SHELL_HANDLER_ENABLED, validate=_check_shell_payload)
+async def shell_handler(ctx: JobContext) -> HandlerResult:
+    """
+    Run payload.command (an argv list, or a string split with shlex; no shell). Exit code 0 is success;
+    the result is the command's combined output, truncated. The process is killed on timeout or cancel.
+    """
+    argv = _shell_argv(ctx.payload)
+    if argv is None:
+        return False, "payload.command must be a non-empty string or list"
+    proc = await asyncio.create_subprocess_exec(
+        *[str(a) for a in argv],
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        cwd=ctx.payload.get("cwd") or None,
+    )
+    try:
+        output, _ = await proc.communicate()
+    except asyncio.CancelledError:
+        proc.kill()
+        await proc.wait()
+        raise
+    text = _truncate(output.decode(errors="replace").strip())
+    if proc.returncode == 0:
+        return True, text or None
+    return False, f"Exit code {proc.returncode}" + (f": {text}" if text else "")
+
+
+def _python_modules() -> list[str]:
+    return [m.strip() for m in settings.WORKER_PYTHON_HANDLER_MODULES.split(",") if m.strip()]
+
+
+def _python_enabled() -> bool:
+    """Enabled and given an allowlist: with an empty one any import path (os:system) would be callable."""
+    return settings.WORKER_PYTHON_HANDLER_ENABLED and bool(_python_modules())
+
+
+def _python_allowed(module_name: str) -> bool:
+    return any(module_name == m or module_name.startswith(m + ".") for m in _python_modules())
+
+
+def resolve_callable(path: str) -> Callable[..., Any]:
+    """'package.module:function' (or 'package.module.function') to the object. Raises ValueError."""
+    module_name, sep, attr = path.partition(":")
+    if not sep:
+        module_name, _, attr = path.rpartition(".")
+    if not module_name or not attr:
+        raise ValueError(f"'{path}' is not a 'module:function' path")
+    if not _python_allowed(module_name):
+        raise ValueError(f"module of '{path}' is not in WORKER_PYTHON_HANDLER_MODULES")
+    target: Any = importlib.import_module(module_name)
+    for part in attr.split("."):
+        target = getattr(target, part)
+    if not callable(target):
+        raise ValueError(f"'{path}' is not callable")
+    return target
+
+
+@register_handler("python", enabled=_python_enabled)
+async def python_handler(ctx: JobContext) -> HandlerResult:
+    """
+    Call payload.callable with payload.args / payload.kwargs. A coroutine function is awaited; a plain
+    function runs in a thread. Returning normally is success (the return value, as text, is the result).
+    """
+    try:
+        func = resolve_callable(str(ctx.payload.get("callable") or ""))
+    except (ValueError, ImportError, AttributeError) as e:
+        return False, f"Cannot load callable: {e}"
+    args = ctx.payload.get("args") or []
+    kwargs = ctx.payload.get("kwargs") or {}
+    if inspect.iscoroutinefunction(func):
+        value = await func(*args, **kwargs)
+    else:
+        value = await asyncio.to_thread(func, *args, **kwargs)
+    return True, None if value is None else _truncate(str(value))
+
+
+@register_handler("python_cpu", kind="cpu", enabled=_python_enabled)
+def python_cpu_handler(job_id: str, payload: dict[str, Any]) -> HandlerResult:
+    """Like python, for CPU-heavy callables: runs in the CPU lane. The callable must be a plain function."""
+    try:
+        func = resolve_callable(str(payload.get("callable") or ""))
+    except (ValueError, ImportError, AttributeError) as e:
+        return False, f"Cannot load callable: {e}"
+    if inspect.iscoroutinefunction(func):
+        return False, "python_cpu needs a plain function; use job_type python for coroutines"
+    value = func(*(payload.get("args") or []), **(payload.get("kwargs") or {}))
+    return True, None if value is None else _truncate(str(value))
+
+
+@register_handler("demo")
+async def demo_handler(ctx: JobContext) -> HandlerResult:
+    """Simulated work for trying the scheduler out: random sleep, optional random failure, then a quote."""
+    await asyncio.sleep(random.uniform(settings.WORKER_EXECUTION_MIN_SLEEP, settings.WORKER_EXECUTION_MAX_SLEEP))
+    if random.random() < settings.WORKER_FAILURE_PROBABILITY:
+        return False, "Simulated failure (for retry testing)"
+    url = "https://api.quotable.io/random"
+    try:
+        async with host_slot(url):
+            r = await get_http_client().get(url)
+        if r.status_code != 200:
+            return False, f"Quote API returned HTTP {r.status_code}"
+        data = r.json()
+        content = data.get("content", "").strip()
+        author = data.get("author", "Unknown")
+        return True, f'"{content}" — {author}'
+    except Exception as e:
+        return False, str(e)
+
+
+def _error_result(e: Exception) -> HandlerResult:
+    return False, _truncate(f"{type(e).__name__}: {e}")
+
+
+def execute_cpu_handler(job_type: str, job_id: str, payload: dict[str, Any]) -> HandlerResult:
+    """
+    Entry point of a CPU-lane child (or thread): find the handler by name in this process's registry
+    and turn an exception into a failed result, so a bad job cannot take down the pool.
+    """
+    handler = get_handler(job_type)
+    if handler is None or handler.kind != "cpu":
+        return False, f"No cpu handler registered for job_type '{job_type}' in the CPU lane"
+    if not handler.enabled():
+        return False, f"Handler '{job_type}' is disabled on this worker"
+    try:
+        return handler.func(job_id, payload)
+    except Exception as e:
+        return _error_result(e)
+
+
+async def run_handler(ctx: JobContext) -> HandlerResult:
+    """
+    Run the handler for ctx.job_type: io on the event loop; cpu in the process pool
+    (WORKER_CPU_PROCESSES > 0) or else in a thread. A handler that raises is a failed attempt
+    (retried per the job's policy), never an error that escapes into the worker's bookkeeping.
+    """
+    handler = get_handler(ctx.job_type)
+    if handler is None:
+        return False, f"No handler registered for job_type '{ctx.job_type}'"
+    if not handler.enabled():
+        return False, f"Handler '{ctx.job_type}' is disabled on this worker"
+    if handler.kind == "cpu":
+        if not cpu_lane_enabled():
+            return await asyncio.to_thread(execute_cpu_handler, ctx.job_type, ctx.job_id, ctx.payload)
+        try:
+            return await run_in_cpu_pool(execute_cpu_handler, ctx.job_type, ctx.job_id, ctx.payload)
+        except BrokenProcessPool:
+            return False, "CPU lane process died while running the job"
+    try:
+        return await handler.func(ctx)
+    except Exception as e:
+        return _error_result(e)
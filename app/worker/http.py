@@ -0,0 +1,73 @@
+"""Worker-lifetime HTTP client: one keep-alive connection pool shared by webhook and quote executions."""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+
+_client: Optional[httpx.AsyncClient] = None
+_host_slots: dict[str, asyncio.Semaphore] = {}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _build_client() -> httpx.AsyncClient:
+    http2 = settings.WORKER_HTTP2
+    if http2 and not _http2_available():
+        print("WORKER_HTTP2 is set but the 'h2' package is not installed; using HTTP/1.1", flush=True)
+        http2 = False
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(
+            settings.WORKER_HTTP_TIMEOUT_SECONDS,
+            connect=settings.WORKER_HTTP_CONNECT_TIMEOUT_SECONDS,
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.WORKER_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.WORKER_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.WORKER_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        http2=http2,
+        verify=settings.WORKER_HTTP_VERIFY_TLS,
+    )
+
+
+async def start_http_client() -> httpx.AsyncClient:
+    """Create the shared client (idempotent). Called once at worker startup."""
+    return get_http_client()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Shared client; created lazily so the API's cron endpoint can use it too."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close pooled connections on shutdown."""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+    _host_slots.clear()
+
+
+@asynccontextmanager
+async def host_slot(url: str) -> AsyncIterator[None]:
+    """Cap concurrent requests per host (WORKER_HTTP_MAX_CONNECTIONS_PER_HOST) so one receiver can't take the whole pool."""
+    host = urlsplit(url).netloc.lower()
+    slot = _host_slots.get(host)
+    if slot is None:
+        slot = _host_slots[host] = asyncio.Semaphore(settings.WORKER_HTTP_MAX_CONNECTIONS_PER_HOST)
+    async with slot:
+        yield
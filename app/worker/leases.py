@@ -0,0 +1,111 @@
+"""Job ownership leases: claimed jobs carry locked_by + lease_expires_at, renewed by a heartbeat while they run."""
+import asyncio
+from datetime import timedelta
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import func, update
+
+from app.db.session import async_session_factory
+from app.models.job import Job, JobStatus
+
+
+def lease_deadline(lease_seconds: float):
+    """SQL expression for a lease expiry, on the database clock so workers' clocks don't matter."""
+    return func.now() + timedelta(seconds=lease_seconds)
+
+
+class LeaseKeeper:
+    """
+    Tracks the jobs this worker owns and renews their leases every `heartbeat_seconds`.
+    A crashed worker stops renewing, so its jobs become recoverable once the lease lapses.
+    A job that can no longer be renewed (cancelled via the API, or recovered after a missed lease)
+    has its in-flight execution cancelled, so it stops early instead of running to completion.
+    Use as `async with LeaseKeeper(...)` to run the heartbeat in the background.
+    """
+
+    def __init__(self, worker_id: str, lease_seconds: float, heartbeat_seconds: float) -> None:
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self._job_ids: set[UUID] = set()
+        self._executions: dict[UUID, asyncio.Future] = {}
+        self.lost: set[UUID] = set()
+        self._task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def job_ids(self) -> set[UUID]:
+        return set(self._job_ids)
+
+    def track(self, job_ids: Iterable[UUID]) -> None:
+        self._job_ids.update(job_ids)
+
+    def untrack(self, job_id: UUID) -> None:
+        self._job_ids.discard(job_id)
+        self._executions.pop(job_id, None)
+        self.lost.discard(job_id)
+
+    def watch(self, job_id: UUID, execution: asyncio.Future) -> None:
+        """Register the running execution so a lost lease can cancel it (at once, if already lost)."""
+        if job_id in self.lost:
+            execution.cancel()
+            return
+        self._executions[job_id] = execution
+
+    def _abort(self, job_ids: set[UUID]) -> None:
+        for job_id in job_ids:
+            self.lost.add(job_id)
+            self._job_ids.discard(job_id)
+            execution = self._executions.pop(job_id, None)
+            if execution is not None and not execution.done():
+                execution.cancel()
+
+    async def renew(self) -> set[UUID]:
+        """Extend leases on tracked jobs still RUNNING under this worker. Returns the ids renewed."""
+        job_ids = list(self._job_ids)
+        if not job_ids:
+            return set()
+        async with async_session_factory() as session:
+            try:
+                result = await session.execute(
+                    update(Job)
+                    .where(
+                        Job.id.in_(job_ids),
+                        Job.locked_by == self.worker_id,
+                        Job.status == JobStatus.RUNNING,
+                    )
+                    .values(lease_expires_at=lease_deadline(self.lease_seconds))
+                    .returning(Job.id)
+                    .execution_options(synchronize_session=False)
+                )
+                renewed = set(result.scalars().all())
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+        lost = set(job_ids) - renewed
+        if lost:
+            print(f"Heartbeat: lost lease on {len(lost)} job(s) (cancelled or recovered); aborting", flush=True)
+            self._abort(lost)
+        return renewed
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                await self.renew()
+            except Exception as e:
+                print(f"Heartbeat error: {e}", flush=True)
+
+    async def __aenter__(self) -> "LeaseKeeper":
+        self._task = asyncio.create_task(self._heartbeat(), name="lease-heartbeat")
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -1,188 +1,594 @@
-"""Worker: poll DB, claim jobs with FOR UPDATE SKIP LOCKED, execute real work, handle retries and crash recovery."""
+"""Worker: poll DB, claim batches of jobs with FOR UPDATE SKIP LOCKED, execute real work, handle retries and crash recovery."""
 import asyncio
 import os
-import random
+import socket
 import sys
 import threading
+import time
+from collections import Counter
 from datetime import datetime, timedelta, timezone
 from http.server import BaseHTTPRequestHandler, HTTPServer
-from typing import Optional, Tuple
+from typing import Any, Optional, Tuple
 
-import httpx
-from sqlalchemy import select, update
+from sqlalchemy import Select, func, select, true, union_all, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import metrics
 from app.core.config import settings
+from app.db.notify import job_event, notify_job_events, notify_job_ready
+from app.db.partitions import maintain_partitions
 from app.db.session import async_session_factory
 from app.models.job import (
     Job,
     JobExecution,
     JobStatus,
+    MisfirePolicy,
     ScheduleType,
     ExecutionStatus,
 )
+from app.services.retention import prune_executions
+from app.services.stats import (
+    bulk_status_change,
+    prune_execution_stats,
+    reconcile_job_counters,
+    record_execution,
+    record_status_changes,
+    status_change,
+)
+from app.services.scheduling import (
+    compute_retry_delay,
+    next_cron_run,
+    next_cron_run_after_misfire,
+    next_interval_run,
+)
+from app.worker.cpu import close_cpu_pool
+from app.worker.handlers import JobContext, run_handler
+from app.worker.http import close_http_client, start_http_client
+from app.worker.leases import LeaseKeeper, lease_deadline
+from app.worker.pool import JobPool
+from app.worker.queues import WeightedQueues, configured_queues
+from app.worker.wakeup import JobWakeup
 
 
 POLL_INTERVAL = settings.WORKER_POLL_INTERVAL_SECONDS
 STALE_MINUTES = settings.WORKER_STALE_RUNNING_MINUTES
-SLEEP_MIN = settings.WORKER_EXECUTION_MIN_SLEEP
-SLEEP_MAX = settings.WORKER_EXECUTION_MAX_SLEEP
-FAILURE_PROBABILITY = settings.WORKER_FAILURE_PROBABILITY
+BATCH_SIZE = max(1, settings.WORKER_BATCH_SIZE)
+CONCURRENCY = max(1, settings.WORKER_CONCURRENCY)
+FALLBACK_POLL_INTERVAL = settings.WORKER_FALLBACK_POLL_SECONDS
+WORKER_ID = settings.WORKER_ID or f"{socket.gethostname()}:{os.getpid()}"
+LEASE_SECONDS = settings.WORKER_LEASE_SECONDS
+HEARTBEAT_INTERVAL = settings.WORKER_HEARTBEAT_SECONDS
+RECOVERY_INTERVAL = settings.WORKER_RECOVERY_INTERVAL_SECONDS
+DEFAULT_TIMEOUT = settings.WORKER_DEFAULT_TIMEOUT_SECONDS
+MAX_CATCHUP_RUNS = max(0, settings.WORKER_MISFIRE_MAX_CATCHUP_RUNS)
 
 
 async def reset_stale_running_jobs(session: AsyncSession) -> int:
-    """Crash recovery: reset RUNNING jobs older than threshold to SCHEDULED."""
+    """
+    Crash recovery: reset RUNNING jobs whose lease has expired to SCHEDULED.
+    Only RUNNING rows are scanned (partial index ix_jobs_running_lease_expires_at). Rows without a lease
+    (claimed before leases existed) fall back to the WORKER_STALE_RUNNING_MINUTES threshold on updated_at.
+    """
     threshold = datetime.now(timezone.utc) - timedelta(minutes=STALE_MINUTES)
     result = await session.execute(
         update(Job)
-        .where(Job.status == JobStatus.RUNNING, Job.updated_at < threshold)
-        .values(status=JobStatus.SCHEDULED)
+        .where(
+            Job.status == JobStatus.RUNNING,
+            (Job.lease_expires_at < func.now())
+            | (Job.lease_expires_at.is_(None) & (Job.updated_at < threshold)),
+        )
+        .values(status=JobStatus.SCHEDULED, version=Job.version + 1, locked_by=None, lease_expires_at=None)
+        .returning(Job.id, Job.schedule_type)
+        .execution_options(synchronize_session=False)
     )
-    return result.rowcount or 0
-
-
-def _run_at_ready(job: Job) -> bool:
-    if job.run_at is None:
-        return True
-    return job.run_at <= datetime.now(timezone.utc)
+    reset = result.all()
+    await record_status_changes(
+        session, bulk_status_change((r.schedule_type for r in reset), JobStatus.RUNNING, JobStatus.SCHEDULED)
+    )
+    await notify_job_events(
+        session, [job_event("job_status", r.id, status=JobStatus.SCHEDULED.value, reason="recovered") for r in reset]
+    )
+    return len(reset)
 
 
-async def fetch_next_job(session: AsyncSession) -> Optional[Job]:
-    """Select one SCHEDULED job ready to run, with FOR UPDATE SKIP LOCKED."""
-    now = datetime.now(timezone.utc)
-    stmt = (
-        select(Job)
-        .where(Job.status == JobStatus.SCHEDULED)
-        .where((Job.run_at.is_(None)) | (Job.run_at <= now))
-        .order_by(Job.run_at.asc().nulls_first())
-        .limit(1)
+def _ready_ids(now: datetime, limit: int, queue: Optional[str] = None, name: str = "bands") -> Select:
+    """
+    Lock up to `limit` ready job ids (SKIP LOCKED), highest priority first, then oldest due.
+    Candidates are found without row locks, one priority band at a time so run_at stays a range bound
+    on the index: a recursive CTE walks the distinct priorities of SCHEDULED jobs (one index probe
+    each, highest first), and each band reads only its due rows. Future jobs are never walked.
+    The outer select then locks candidates in claim order and stops at `limit`, re-checking each row's
+    status, so only the rows actually claimed are locked. Reading WORKER_CLAIM_OVERFETCH candidates per
+    slot leaves enough for that many workers claiming at the same moment to each fill their batch.
+    """
+    candidates = limit * max(1, settings.WORKER_CLAIM_OVERFETCH)
+    scope = [Job.status == JobStatus.SCHEDULED]
+    if queue is not None:
+        scope.append(Job.queue == queue)
+    bands = select(func.max(Job.priority).label("priority")).where(*scope).cte(name, recursive=True)
+    lower = select(func.max(Job.priority)).where(*scope, Job.priority < bands.c.priority).scalar_subquery()
+    bands = bands.union_all(select(lower).where(bands.c.priority.is_not(None)))
+    due = (
+        select(Job.id, Job.priority, Job.run_at)
+        .where(*scope, Job.priority == bands.c.priority, Job.run_at <= now)
+        .order_by(Job.run_at.asc())
+        .limit(candidates)
+        .lateral()
+    )
+    picked = (
+        select(due.c.id)
+        .select_from(bands)
+        .join(due, true())
+        .order_by(due.c.priority.desc(), due.c.run_at.asc())
+        .limit(candidates)
+    )
+    return (
+        select(Job.id)
+        .where(Job.id.in_(picked), Job.status == JobStatus.SCHEDULED, Job.run_at <= now)
+        .order_by(Job.priority.desc(), Job.run_at.asc())
+        .limit(limit)
         .with_for_update(skip_locked=True)
     )
-    result = await session.execute(stmt)
-    job = result.scalar_one_or_none()
-    return job
 
 
-def _is_webhook_url(url: str) -> bool:
-    """True if this looks like a valid HTTP(S) URL for webhook."""
-    u = (url or "").strip()
-    return bool(u and isinstance(u, str) and (u.startswith("http://") or u.startswith("https://")))
+async def _claim_ids(session: AsyncSession, ids: Select) -> list[Job]:
+    result = await session.execute(
+        update(Job)
+        .where(Job.id.in_(ids))
+        .values(
+            status=JobStatus.RUNNING,
+            locked_by=WORKER_ID,
+            lease_expires_at=lease_deadline(LEASE_SECONDS),
+            version=Job.version + 1,
+        )
+        .returning(Job)
+        .execution_options(synchronize_session=False)
+    )
+    return list(result.scalars().all())
 
 
-async def _do_webhook(job: Job) -> Tuple[bool, str]:
-    """POST job details to webhook_url in payload. Returns (success, message)."""
-    payload = job.payload if isinstance(job.payload, dict) else {}
-    url = (payload.get("webhook_url") or payload.get("callback_url") or "").strip()
-    if not _is_webhook_url(url):
-        return False, ""
-    body = {
-        "job_id": str(job.id),
-        "job_name": job.name,
-        "run_at": datetime.now(timezone.utc).isoformat(),
-        "schedule_type": job.schedule_type.value,
-        "attempt": job.retry_count + 1,
-    }
-    try:
-        async with httpx.AsyncClient(timeout=10.0, verify=False) as client:
-            r = await client.post(url, json=body)
-            if 200 <= r.status_code < 300:
-                return True, f"Webhook delivered to {url[:50]}... (HTTP {r.status_code})"
-            return False, f"Webhook returned HTTP {r.status_code}"
-    except Exception as e:
-        return False, str(e)
+async def claim_jobs(session: AsyncSession, limit: int, queues: Optional[WeightedQueues] = None) -> list[Job]:
+    """
+    Claim up to `limit` ready jobs and mark them RUNNING.
+    UPDATE ... RETURNING over FOR UPDATE SKIP LOCKED subselects, so concurrent workers never claim the same row.
+    Without `queues` this is one round trip across all queues by priority. With them, the slots are split
+    by weight and each queue fills its share in the same statement (UNION ALL of per-queue subselects);
+    slots a short queue leaves unused go to the other subscribed queues, heaviest first, one statement each.
+    """
+    now = datetime.now(timezone.utc)
+    with metrics.CLAIM_SECONDS.time():
+        if queues is None:
+            jobs = await _claim_ids(session, _ready_ids(now, limit))
+        else:
+            plan = queues.plan(limit)
+            shares = [_ready_ids(now, n, name, f"bands_{i}").subquery() for i, (name, n) in enumerate(plan.items())]
+            jobs = await _claim_ids(session, union_all(*(select(s.c.id) for s in shares)))
+            claimed = Counter(j.queue for j in jobs)
+            # Queues that filled their share (or had none this round) may have more ready jobs
+            more = [name for name in queues.names if claimed[name] >= plan.get(name, 0)]
+            for name in sorted(more, key=lambda q: -queues.weights[q]):
+                if len(jobs) >= limit:
+                    break
+                jobs += await _claim_ids(session, _ready_ids(now, limit - len(jobs), name))
+    await record_status_changes(
+        session, bulk_status_change((j.schedule_type for j in jobs), JobStatus.SCHEDULED, JobStatus.RUNNING)
+    )
+    await notify_job_events(
+        session, [job_event("job_status", j.id, status=JobStatus.RUNNING.value, version=j.version) for j in jobs]
+    )
+    # RETURNING order is unspecified; run by priority, then oldest-due first
+    jobs.sort(key=lambda j: (-j.priority, j.run_at or now))
+    return jobs
+
+
+def job_context(job: Job) -> JobContext:
+    """Plain-value view of a claimed job for its handler."""
+    return JobContext(
+        job_id=str(job.id),
+        name=job.name,
+        job_type=job.job_type,
+        schedule_type=job.schedule_type.value,
+        attempt=job.retry_count + 1,
+        payload=job.payload if isinstance(job.payload, dict) else {},
+    )
 
 
-async def _do_fetch_quote() -> Tuple[bool, str]:
-    """Fetch a random quote from a public API. Returns (success, quote or error)."""
-    try:
-        async with httpx.AsyncClient(timeout=8.0, verify=False) as client:
-            r = await client.get("https://api.quotable.io/random")
-            if r.status_code != 200:
-                return False, f"Quote API returned HTTP {r.status_code}"
-            data = r.json()
-            content = data.get("content", "").strip()
-            author = data.get("author", "Unknown")
-            return True, f'"{content}" — {author}'
-    except Exception as e:
-        return False, str(e)
+async def execute_job(job: Job) -> Tuple[bool, Optional[str]]:
+    """
+    Run the handler registered for the job's job_type (app.worker.handlers).
+    Runs outside any DB transaction. Returns (success, result_message or error_message).
+    """
+    return await run_handler(job_context(job))
 
 
-async def execute_job(session: AsyncSession, job: Job) -> Tuple[bool, Optional[str]]:
+async def _execute_with_deadline(
+    job: Job, leases: Optional[LeaseKeeper], budget: Optional[float] = None
+) -> Tuple[ExecutionStatus, Optional[str]]:
     """
-    Do real work: webhook POST if payload has webhook_url, else fetch a real quote from API.
-    Returns (success, result_message or error_message).
+    Run execute_job under the job's timeout. The execution runs as its own task so a lost lease
+    (job cancelled via the API) can cancel just the work, not the bookkeeping around it.
+    `budget` (seconds left in a cron tick) can cut the run short; that is an interruption, not a timeout.
     """
-    await asyncio.sleep(random.uniform(SLEEP_MIN, SLEEP_MAX))
-    if random.random() < FAILURE_PROBABILITY:
-        return False, "Simulated failure (for retry testing)"
-
-    success, message = await _do_webhook(job)
+    timeout = job.timeout_seconds or DEFAULT_TIMEOUT
+    limit = timeout if budget is None else max(0.0, min(timeout, budget))
+    work = asyncio.ensure_future(execute_job(job))
+    if leases is not None:
+        leases.watch(job.id, work)
+    try:
+        success, message = await asyncio.wait_for(work, limit)
+    except asyncio.TimeoutError:
+        if limit < timeout:
+            return ExecutionStatus.CANCELLED, f"Interrupted after {limit:.1f}s: cron time budget exhausted"
+        return ExecutionStatus.TIMEOUT, f"Timed out after {timeout}s"
+    except asyncio.CancelledError:
+        current = asyncio.current_task()
+        if current is not None and current.cancelling():
+            raise  # worker shutdown, not a job cancellation
+        return ExecutionStatus.CANCELLED, "Cancelled while running"
     if success:
-        return True, message
-    if message:
-        return False, f"Webhook failed: {message}"
+        return ExecutionStatus.SUCCESS, message
+    return ExecutionStatus.FAILED, message
 
-    success, result = await _do_fetch_quote()
-    return success, result
 
-
-async def process_one_job(session: AsyncSession) -> bool:
+def _next_recurring_run(job: Job, started: datetime, now: datetime) -> Optional[datetime]:
     """
-    Fetch one job (FOR UPDATE SKIP LOCKED), run it, update status and executions.
-    Returns True if a job was processed, False if none available.
+    Next run_at of an interval or cron job, anchored to the run_at it was scheduled for
+    (not to when it finished) and resolved through its misfire policy. None for one-time jobs.
+    A retry runs off the grid, so its anchor is the slot being retried (retry_of_run_at).
     """
-    job = await fetch_next_job(session)
-    if job is None:
+    anchor = job.retry_of_run_at or job.run_at or started
+    policy = job.misfire_policy or MisfirePolicy.COALESCE
+    if job.schedule_type == ScheduleType.INTERVAL and job.interval_seconds:
+        return next_interval_run(anchor, job.interval_seconds, started, now, policy, MAX_CATCHUP_RUNS)
+    if job.schedule_type == ScheduleType.CRON and job.cron_expression:
+        return next_cron_run_after_misfire(
+            job.cron_expression, job.cron_timezone, anchor, started, now, policy, MAX_CATCHUP_RUNS
+        )
+    return None
+
+
+def run_is_misfired(job: Job, now: datetime) -> bool:
+    """True if a recurring job is so late that its next fire time has already passed too."""
+    if job.run_at is None:
         return False
+    if job.schedule_type == ScheduleType.INTERVAL and job.interval_seconds:
+        return job.run_at + timedelta(seconds=job.interval_seconds) <= now
+    if job.schedule_type == ScheduleType.CRON and job.cron_expression:
+        return next_cron_run(job.cron_expression, job.cron_timezone, job.run_at) <= now
+    return False
 
+
+def next_job_state(
+    job: Job, outcome: ExecutionStatus, now: datetime, started: Optional[datetime] = None
+) -> Tuple[dict[str, Any], Optional[float]]:
+    """
+    Column values for a claimed job after an execution with `outcome` (status, run_at, retry_count),
+    plus the retry backoff in seconds when a retry is scheduled. `started` is when the execution began.
+    """
     attempt = job.retry_count + 1
-    execution = JobExecution(
-        job_id=job.id,
-        attempt_number=attempt,
-        status=ExecutionStatus.FAILED,
-        error_message=None,
+    if outcome == ExecutionStatus.SUCCESS:
+        next_run = _next_recurring_run(job, started or now, now)
+        if next_run is not None:
+            return {"status": JobStatus.SCHEDULED, "run_at": next_run, "retry_of_run_at": None}, None
+        return {"status": JobStatus.COMPLETED}, None
+    if attempt >= job.max_retries:
+        return {"status": JobStatus.FAILED}, None
+    delay = compute_retry_delay(
+        job.retry_policy, job.retry_delay_seconds, job.retry_max_delay_seconds, attempt
     )
-    session.add(execution)
-    job.status = JobStatus.RUNNING
-    await session.flush()
+    # so next run is attempt+1, no earlier than the backoff; the slot it retries stays the grid anchor
+    return {
+        "status": JobStatus.SCHEDULED,
+        "retry_count": attempt,
+        "run_at": now + timedelta(seconds=delay),
+        "retry_of_run_at": job.retry_of_run_at or job.run_at,
+    }, delay
+
+
+def execution_totals(outcome: ExecutionStatus, duration_seconds: Optional[float]) -> dict[str, Any]:
+    """Increments of the job's lifetime counters for one finished execution (CANCELLED is a run, not a failure)."""
+    values: dict[str, Any] = {"run_count": Job.run_count + 1, "last_duration_seconds": duration_seconds}
+    if outcome == ExecutionStatus.SUCCESS:
+        values["success_count"] = Job.success_count + 1
+    elif outcome in (ExecutionStatus.FAILED, ExecutionStatus.TIMEOUT):
+        values["failure_count"] = Job.failure_count + 1
+    return values
+
+
+async def start_execution(job: Job) -> JobExecution:
+    """Insert the JobExecution row for this attempt in its own short transaction."""
+    async with async_session_factory() as session:
+        try:
+            execution = JobExecution(
+                job_id=job.id,
+                attempt_number=job.retry_count + 1,
+                status=ExecutionStatus.FAILED,
+                error_message=None,
+            )
+            session.add(execution)
+            await session.flush()
+            await notify_job_events(
+                session,
+                [
+                    job_event(
+                        "execution_started",
+                        job.id,
+                        execution_id=execution.id,
+                        attempt=execution.attempt_number,
+                        started_at=execution.started_at,
+                    )
+                ],
+            )
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+    return execution
 
-    success, result_message = await execute_job(session, job)
 
+async def finish_execution(
+    job: Job,
+    execution: JobExecution,
+    outcome: ExecutionStatus,
+    message: Optional[str],
+    started: Optional[datetime] = None,
+) -> bool:
+    """
+    Record the outcome and move the job to its next status in one short transaction.
+    The job update is conditional on the version this worker claimed: if the job was cancelled,
+    paused or recovered meanwhile, only the execution and the job's run counters are recorded.
+    Returns True if the job was updated.
+    """
     now = datetime.now(timezone.utc)
-    execution.finished_at = now
-    if success:
-        execution.status = ExecutionStatus.SUCCESS
-        execution.result = result_message
-        if job.schedule_type == ScheduleType.INTERVAL and job.interval_seconds:
-            job.status = JobStatus.SCHEDULED
-            job.run_at = now + timedelta(seconds=job.interval_seconds)
-        else:
-            job.status = JobStatus.COMPLETED
-    else:
-        execution.error_message = result_message or "Execution failed"
-        if attempt >= job.max_retries:
-            job.status = JobStatus.FAILED
-        else:
-            job.status = JobStatus.SCHEDULED
-            job.retry_count = attempt  # so next run is attempt+1
+    totals = execution_totals(outcome, (now - started).total_seconds() if started is not None else None)
+    async with async_session_factory() as session:
+        try:
+            session.add(execution)
+            execution.finished_at = now
+            execution.status = outcome
+            if outcome == ExecutionStatus.SUCCESS:
+                execution.result = message
+            else:
+                execution.error_message = message or "Execution failed"
+
+            applied = False
+            new_status: Optional[JobStatus] = None
+            events = [
+                job_event(
+                    "execution_finished",
+                    job.id,
+                    execution_id=execution.id,
+                    status=outcome.value,
+                    attempt=execution.attempt_number,
+                    duration_seconds=totals.get("last_duration_seconds"),
+                    # Enough for a dashboard card; the full text is on the execution
+                    message=((execution.result if outcome == ExecutionStatus.SUCCESS else execution.error_message) or "")[:200],
+                )
+            ]
+            if outcome != ExecutionStatus.CANCELLED:
+                values, retry_delay = next_job_state(job, outcome, now, started)
+                execution.retry_delay_seconds = retry_delay
+                result = await session.execute(
+                    update(Job)
+                    .where(
+                        Job.id == job.id,
+                        Job.version == job.version,
+                        Job.status == JobStatus.RUNNING,
+                        Job.locked_by == WORKER_ID,
+                    )
+                    .values(**values, **totals, version=Job.version + 1, locked_by=None, lease_expires_at=None)
+                    .execution_options(synchronize_session=False)
+                )
+                applied = result.rowcount == 1
+                if applied:
+                    new_status = values["status"]
+                    await record_status_changes(
+                        session, status_change(job.schedule_type, JobStatus.RUNNING, values["status"])
+                    )
+                    events.append(
+                        job_event(
+                            "job_status",
+                            job.id,
+                            status=values["status"].value,
+                            run_at=values.get("run_at", job.run_at),
+                            retry_count=values.get("retry_count", job.retry_count),
+                            version=job.version + 1,
+                        )
+                    )
+                if applied and values["status"] == JobStatus.SCHEDULED:
+                    await notify_job_ready(session, values.get("run_at", job.run_at))
+                if not applied:
+                    print(f"Job {job.id} changed while running; recorded execution only", flush=True)
+            if not applied:
+                await session.execute(
+                    update(Job).where(Job.id == job.id).values(**totals).execution_options(synchronize_session=False)
+                )
+            await record_execution(session, outcome)
+            await notify_job_events(session, events)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+    if new_status == JobStatus.FAILED:
+        metrics.JOBS_FAILED.inc()
+    elif new_status == JobStatus.SCHEDULED and outcome != ExecutionStatus.SUCCESS:
+        metrics.JOBS_RETRIED.inc()
+    return applied
 
-    await session.flush()
-    return True
+
+async def process_job(
+    job: Job, leases: Optional[LeaseKeeper] = None, budget: Optional[float] = None
+) -> Optional[ExecutionStatus]:
+    """
+    Run a claimed (RUNNING) job: short transaction to record the attempt, execution outside any
+    transaction (no pooled connection or row lock held), short transaction to finalize.
+    Returns the execution outcome, or None if a misfired run was skipped.
+    """
+    started = datetime.now(timezone.utc)
+    if job.misfire_policy == MisfirePolicy.SKIP and run_is_misfired(job, started):
+        await skip_misfired_run(job, started)
+        return None
+    execution = await start_execution(job)
+    run_started = time.perf_counter()
+    outcome, result_message = await _execute_with_deadline(job, leases, budget)
+    metrics.EXECUTION_SECONDS.labels(outcome.value).observe(time.perf_counter() - run_started)
+    metrics.JOBS_PROCESSED.labels(outcome.value).inc()
+    await finish_execution(job, execution, outcome, result_message, started)
+    if outcome == ExecutionStatus.CANCELLED:
+        # Interrupted by a cron budget: hand the job straight back. A job cancelled via the API
+        # has a newer version already, so the release is a no-op for it.
+        await _release_job(job)
+    return outcome
+
+
+async def skip_misfired_run(job: Job, now: datetime) -> None:
+    """misfire_policy=skip: drop a run that is a full period late and move the job to its next fire time."""
+    next_run = _next_recurring_run(job, now, now)
+    async with async_session_factory() as session:
+        try:
+            result = await session.execute(
+                update(Job)
+                .where(Job.id == job.id, Job.version == job.version, Job.locked_by == WORKER_ID)
+                .values(
+                    status=JobStatus.SCHEDULED,
+                    run_at=next_run,
+                    retry_of_run_at=None,
+                    version=Job.version + 1,
+                    locked_by=None,
+                    lease_expires_at=None,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 1:
+                await record_status_changes(
+                    session, status_change(job.schedule_type, JobStatus.RUNNING, JobStatus.SCHEDULED)
+                )
+                await notify_job_ready(session, next_run)
+                await notify_job_events(
+                    session,
+                    [job_event("job_status", job.id, status=JobStatus.SCHEDULED.value, run_at=next_run, reason="misfire_skipped")],
+                )
+                print(f"Job {job.id} missed its run at {job.run_at}; skipped to {next_run}", flush=True)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+async def _release_job(job: Job) -> None:
+    """Put a claimed job back to SCHEDULED after an unexpected error, instead of waiting for stale recovery."""
+    async with async_session_factory() as session:
+        try:
+            result = await session.execute(
+                update(Job)
+                .where(Job.id == job.id, Job.version == job.version, Job.locked_by == WORKER_ID)
+                .values(status=JobStatus.SCHEDULED, version=Job.version + 1, locked_by=None, lease_expires_at=None)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 1:
+                await record_status_changes(
+                    session, status_change(job.schedule_type, JobStatus.RUNNING, JobStatus.SCHEDULED)
+                )
+                await notify_job_events(
+                    session, [job_event("job_status", job.id, status=JobStatus.SCHEDULED.value, reason="released")]
+                )
+            await session.commit()
+        except Exception as e:
+            print(f"Release job {job.id} error: {e}", flush=True)
+            await session.rollback()
+
+
+async def run_claimed_job(job: Job, leases: LeaseKeeper, budget: Optional[float] = None) -> str:
+    """Process one claimed job. Returns its outcome: an ExecutionStatus value, 'skipped' or 'error'."""
+    try:
+        with metrics.JOBS_IN_FLIGHT.track_inprogress():
+            outcome = await process_job(job, leases, budget)
+        return outcome.value if outcome is not None else "skipped"
+    except Exception as e:
+        print(f"Process job {job.id} error: {e}", flush=True)
+        await _release_job(job)
+        return "error"
+    finally:
+        leases.untrack(job.id)
+
+
+async def next_scheduled_run_at(session: AsyncSession) -> Optional[datetime]:
+    """Earliest run_at among SCHEDULED jobs, so the loop can sleep exactly until it."""
+    result = await session.execute(
+        select(func.min(Job.run_at)).where(Job.status == JobStatus.SCHEDULED)
+    )
+    return result.scalar_one_or_none()
+
+
+async def claim_batch(limit: int, leases: LeaseKeeper) -> list[Job]:
+    """Claim up to `limit` ready jobs in a short transaction, commit them as RUNNING and start renewing their leases."""
+    async with async_session_factory() as session:
+        try:
+            jobs = await claim_jobs(session, limit, configured_queues())
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+    # A full batch means due jobs are still waiting behind it; a short one drained the queue
+    lag = 0.0
+    oldest = min((j.run_at for j in jobs if j.run_at is not None), default=None)
+    if len(jobs) >= limit and oldest is not None:
+        lag = max(0.0, (datetime.now(timezone.utc) - oldest).total_seconds())
+    metrics.QUEUE_LAG_SECONDS.set(lag)
+    leases.track(j.id for j in jobs)
+    return jobs
 
 
 async def run_crash_recovery(session: AsyncSession) -> None:
     n = await reset_stale_running_jobs(session)
+    metrics.JOBS_RECOVERED.inc(n)
     if n:
         print(f"Crash recovery: reset {n} stale RUNNING job(s) to SCHEDULED", flush=True)
+        await notify_job_ready(session)
     await session.commit()
 
 
-async def run_execute_pending_jobs(max_jobs: int = 10) -> Tuple[int, int]:
+async def _run_timed_job(
+    job: Job, leases: LeaseKeeper, tick_start: float, finish_by: Optional[float]
+) -> dict[str, Any]:
+    """
+    Run a claimed job for a cron tick and report how late it started (relative to its run_at), when it
+    started (relative to the tick) and how long it took.
+    """
+    started = time.monotonic()
+    lateness = None if job.run_at is None else datetime.now(timezone.utc) - job.run_at
+    budget = None if finish_by is None else finish_by - started
+    outcome = await run_claimed_job(job, leases, budget)
+    return {
+        "job_id": str(job.id),
+        "name": job.name,
+        "outcome": outcome,
+        "lateness_ms": round(lateness.total_seconds() * 1000, 1) if lateness is not None else None,
+        "started_ms": round((started - tick_start) * 1000, 1),
+        "duration_ms": round((time.monotonic() - started) * 1000, 1),
+    }
+
+
+async def run_execute_pending_jobs(
+    max_jobs: int = 10,
+    budget_seconds: Optional[float] = None,
+    concurrency: int = 1,
+    reserve_seconds: float = 0.0,
+) -> Tuple[int, list[dict[str, Any]]]:
     """
-    One-shot: run crash recovery then process up to max_jobs pending jobs.
+    One-shot: run crash recovery, then claim and run pending jobs, `concurrency` at a time, until
+    `max_jobs` were claimed, the queue is empty, or the wall-clock budget nearly runs out.
+    No new jobs are claimed in the last 2 * reserve_seconds of the budget; jobs still running
+    reserve_seconds before it ends are interrupted and released back to SCHEDULED.
     Used by POST /api/cron/execute-pending-jobs (GitHub Actions cron).
-    Returns (stale_reset_count, jobs_processed_count).
+    Returns (stale_reset_count, per-job timings).
     """
+    tick_start = time.monotonic()
+    finish_by = claim_until = None
+    if budget_seconds is not None:
+        finish_by = tick_start + budget_seconds - reserve_seconds
+        claim_until = finish_by - reserve_seconds
+
     stale_reset = 0
     async with async_session_factory() as session:
         try:
@@ -194,23 +600,44 @@ async def run_execute_pending_jobs(max_jobs: int = 10) -> Tuple[int, int]:
             await session.rollback()
             raise
 
-    processed = 0
-    for _ in range(max_jobs):
-        async with async_session_factory() as session:
-            try:
-                did_one = await process_one_job(session)
-                if did_one:
-                    await session.commit()
-                    processed += 1
-                else:
+    tasks: list[asyncio.Task[Any]] = []
+    async with _lease_keeper() as leases:
+        pool = JobPool(concurrency, lambda job: _run_timed_job(job, leases, tick_start, finish_by))
+        try:
+            while len(tasks) < max_jobs:
+                left = None if claim_until is None else claim_until - time.monotonic()
+                if left is not None and left <= 0:
                     break
-            except Exception:
-                await session.rollback()
-                raise
-    return stale_reset, processed
+                limit = min(BATCH_SIZE, pool.free_slots, max_jobs - len(tasks))
+                if limit == 0:
+                    await pool.wait_for_slot(left)
+                    continue
+                jobs = await claim_batch(limit, leases)
+                tasks.extend(pool.submit(job) for job in jobs)
+                if len(jobs) < limit:
+                    if pool.in_flight == 0:
+                        break
+                    # Queue drained for now; finishing jobs may make more due (retries, interval runs)
+                    await pool.wait_for_slot(left)
+        finally:
+            await pool.drain()
+    return stale_reset, [t.result() for t in tasks if not t.cancelled() and t.exception() is None]
+
+
+async def _arm_next_wakeup(wakeup: JobWakeup) -> None:
+    """Set the wakeup timer for the next future job; due-but-locked jobs are left to the fallback poll."""
+    async with async_session_factory() as session:
+        next_run_at = await next_scheduled_run_at(session)
+    if next_run_at is not None and next_run_at > datetime.now(timezone.utc):
+        wakeup.wake_at(next_run_at)
 
 
-async def worker_loop() -> None:
+def _lease_keeper() -> LeaseKeeper:
+    return LeaseKeeper(WORKER_ID, LEASE_SECONDS, HEARTBEAT_INTERVAL)
+
+
+async def recovery_loop() -> None:
+    """Lease sweep on its own timer, independent of how busy the claim loop is."""
     while True:
         async with async_session_factory() as session:
             try:
@@ -218,41 +645,134 @@ async def worker_loop() -> None:
             except Exception as e:
                 print(f"Crash recovery error: {e}", flush=True)
                 await session.rollback()
+        await asyncio.sleep(RECOVERY_INTERVAL)
+
+
+async def retention_loop() -> None:
+    """
+    Execution history upkeep on its own timer: keep job_executions partitions created ahead (and drop
+    expired ones), then prune rows in small batches (one worker at a time, via an advisory lock).
+    """
+    while True:
+        try:
+            created, dropped = await maintain_partitions()
+            if created or dropped:
+                print(f"Partitions: created {created or '-'}, dropped {dropped or '-'}", flush=True)
+        except Exception as e:
+            print(f"Partition maintenance error: {e}", flush=True)
+        try:
+            deleted = await prune_executions()
+            if deleted:
+                print(f"Retention: deleted {deleted} old execution row(s)", flush=True)
+        except Exception as e:
+            print(f"Retention error: {e}", flush=True)
+        await asyncio.sleep(settings.EXECUTION_RETENTION_INTERVAL_SECONDS)
 
+
+async def stats_loop() -> None:
+    """
+    Hourly, drop execution stats buckets past the longest window. When STATS_RECONCILE_INTERVAL_SECONDS
+    is set, also recount job_counters on that period (drift safety net; one worker at a time).
+    """
+    interval = settings.STATS_RECONCILE_INTERVAL_SECONDS
+    while True:
         async with async_session_factory() as session:
             try:
-                processed = await process_one_job(session)
-                if processed:
-                    await session.commit()
-                # else no job claimed, nothing to commit
+                if interval > 0 and await reconcile_job_counters(session):
+                    print("Stats: corrected job_counters drift", flush=True)
+                await prune_execution_stats(session)
+                await session.commit()
             except Exception as e:
-                print(f"Process job error: {e}", flush=True)
+                print(f"Stats maintenance error: {e}", flush=True)
                 await session.rollback()
+        await asyncio.sleep(interval if interval > 0 else 3600)
 
-        await asyncio.sleep(POLL_INTERVAL)
+
+async def worker_loop() -> None:
+    wakeup = JobWakeup(FALLBACK_POLL_INTERVAL, POLL_INTERVAL, enabled=settings.WORKER_LISTEN_ENABLED)
+    recovery = asyncio.create_task(recovery_loop(), name="crash-recovery")
+    retention = asyncio.create_task(retention_loop(), name="retention")
+    stats = asyncio.create_task(stats_loop(), name="stats")
+    try:
+        async with _lease_keeper() as leases:
+            pool = JobPool(CONCURRENCY, lambda job: run_claimed_job(job, leases))
+            while True:
+                # Backpressure: only claim as many jobs as there are free slots
+                limit = min(BATCH_SIZE, pool.free_slots)
+                if limit == 0:
+                    await pool.wait_for_slot()
+                    continue
+
+                claimed = 0
+                try:
+                    for job in await claim_batch(limit, leases):
+                        pool.submit(job)
+                        claimed += 1
+                except Exception as e:
+                    print(f"Claim jobs error: {e}", flush=True)
+
+                # A full batch means more jobs are probably due: go again without sleeping
+                if claimed < limit:
+                    try:
+                        await _arm_next_wakeup(wakeup)
+                    except Exception as e:
+                        print(f"Next run_at lookup error: {e}", flush=True)
+                    await wakeup.wait()
+    finally:
+        recovery.cancel()
+        retention.cancel()
+        stats.cancel()
+        await wakeup.close()
 
 
 def _run_health_server(port: int) -> None:
     """Run a minimal HTTP server for Fly.io / Render health checks (runs in a daemon thread)."""
     class Handler(BaseHTTPRequestHandler):
         def do_GET(self) -> None:
+            body, content_type = b"ok", "text/plain"
+            if self.path.split("?")[0] == "/metrics" and settings.METRICS_ENABLED:
+                body, content_type = metrics.render_metrics()
             self.send_response(200)
-            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Type", content_type)
             self.end_headers()
-            self.wfile.write(b"ok")
+            self.wfile.write(body)
         def log_message(self, format: str, *args: object) -> None:
             pass
     server = HTTPServer(("0.0.0.0", port), Handler)
     server.serve_forever()
 
+async def run_worker() -> None:
+    """Worker lifetime: open the shared HTTP client, run the loop, close pooled connections and the CPU lane on exit."""
+    await start_http_client()
+    try:
+        await worker_loop()
+    finally:
+        await close_http_client()
+        await close_cpu_pool()
+
+
 def main() -> None:
     # When running in same container as API (RUN_WORKER=true), use different port so API keeps PORT
     port = int(os.environ.get("WORKER_HEALTH_PORT", os.environ.get("PORT", "8080")))
+    # Fail at startup, not on the first claim, if WORKER_QUEUES is malformed
+    queues = configured_queues()
     t = threading.Thread(target=_run_health_server, args=(port,), daemon=True)
     t.start()
-    print("Worker started (poll every %s s, stale threshold %s min, health on :%s)" % (POLL_INTERVAL, STALE_MINUTES, port), flush=True)
+    print(
+        "Worker %s started (LISTEN wakeups, fallback poll %s s, batch %s, concurrency %s, lease %s s, queues %s, health on :%s)"
+        % (
+            WORKER_ID,
+            FALLBACK_POLL_INTERVAL,
+            BATCH_SIZE,
+            CONCURRENCY,
+            LEASE_SECONDS,
+            ", ".join(f"{q}:{w}" for q, w in queues.weights.items()) if queues else "all",
+            port,
+        ),
+        flush=True,
+    )
     try:
-        asyncio.run(worker_loop())
+        asyncio.run(run_worker())
     except KeyboardInterrupt:
         print("Worker stopped", flush=True)
         sys.exit(0)
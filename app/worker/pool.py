@@ -0,0 +1,42 @@
+"""Bounded in-process pool: run claimed jobs concurrently as asyncio tasks."""
+import asyncio
+from typing import Any, Awaitable, Callable
+
+from app.models.job import Job
+
+
+class JobPool:
+    """
+    Fixed number of slots for in-flight jobs. Callers claim at most `free_slots` jobs,
+    which gives backpressure: the worker never holds more RUNNING jobs than it can execute.
+    """
+
+    def __init__(self, size: int, runner: Callable[[Job], Awaitable[Any]]) -> None:
+        self.size = max(1, size)
+        self._runner = runner
+        self._tasks: set[asyncio.Task[Any]] = set()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    @property
+    def free_slots(self) -> int:
+        return self.size - len(self._tasks)
+
+    def submit(self, job: Job) -> asyncio.Task[Any]:
+        """Start running a claimed job; it owns its session and transaction."""
+        task = asyncio.create_task(self._runner(job), name=f"job-{job.id}")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def wait_for_slot(self, timeout: float | None = None) -> None:
+        """Block until at least one in-flight job finishes (or timeout)."""
+        if self._tasks:
+            await asyncio.wait(set(self._tasks), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+    async def drain(self) -> None:
+        """Wait for every in-flight job to finish."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
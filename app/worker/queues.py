@@ -0,0 +1,57 @@
+"""
+Queue subscriptions for a worker: WORKER_QUEUES="critical:5,default:1".
+
+Each claim splits its free slots across the subscribed queues with smooth weighted round-robin (the
+nginx upstream algorithm). Over any run of sum(weights) slots a queue with weight w gets exactly w of
+them, and the position is remembered between claims. Even a weight-1 queue next to a busy weight-100
+queue is offered a slot at least once every 101 slots, so it never starves. Within a queue, jobs are
+claimed by priority (highest first), then run_at.
+"""
+from functools import lru_cache
+from typing import Optional
+
+from app.core.config import settings
+from app.core.queues import parse_queue_weights
+
+
+class WeightedQueues:
+    """Smooth weighted round-robin over queue names; plan() hands out claim slots."""
+
+    def __init__(self, weights: dict[str, int]):
+        if not weights:
+            raise ValueError("at least one queue is required")
+        self.weights = dict(weights)
+        self._total = sum(self.weights.values())
+        self._current = {name: 0 for name in self.weights}
+
+    @property
+    def names(self) -> list[str]:
+        return list(self.weights)
+
+    def next(self) -> str:
+        """The queue that gets the next slot."""
+        for name, weight in self.weights.items():
+            self._current[name] += weight
+        chosen = max(self._current, key=self._current.__getitem__)
+        self._current[chosen] -= self._total
+        return chosen
+
+    def plan(self, limit: int) -> dict[str, int]:
+        """Slots per queue for a claim of `limit` jobs (queues without a slot are left out)."""
+        counts: dict[str, int] = {}
+        for _ in range(max(0, limit)):
+            name = self.next()
+            counts[name] = counts.get(name, 0) + 1
+        return counts
+
+
+def worker_queues(spec: str) -> Optional[WeightedQueues]:
+    """WeightedQueues for a WORKER_QUEUES value, or None (claim from every queue) when it is empty."""
+    weights = parse_queue_weights(spec)
+    return WeightedQueues(weights) if weights else None
+
+
+@lru_cache
+def configured_queues() -> Optional[WeightedQueues]:
+    """This process's WORKER_QUEUES, parsed on first use so a bad value fails the worker, not every importer."""
+    return worker_queues(settings.WORKER_QUEUES)
@@ -0,0 +1,90 @@
+"""Worker wakeups: Postgres LISTEN on jobs_ready, a timer for the next known run_at, and a slow fallback poll."""
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from app.db.notify import JOBS_READY_CHANNEL
+from app.db.session import connect_raw
+
+
+def _parse_run_at(payload: str) -> Optional[datetime]:
+    if not payload:
+        return None
+    try:
+        return datetime.fromisoformat(payload)
+    except ValueError:
+        return None
+
+
+class JobWakeup:
+    """
+    Holds one dedicated LISTEN connection and an event the worker loop waits on.
+    NOTIFY for a due job wakes the loop at once; a future run_at arms a single timer
+    (only the earliest one is kept). If LISTEN is unavailable, waits fall back to `poll_seconds`.
+    """
+
+    def __init__(self, fallback_seconds: float, poll_seconds: float, enabled: bool = True) -> None:
+        self.fallback_seconds = fallback_seconds
+        self.poll_seconds = poll_seconds
+        self.enabled = enabled
+        self._event = asyncio.Event()
+        self._conn: Any = None
+        self._next_connect_attempt = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_at: Optional[datetime] = None
+
+    @property
+    def listening(self) -> bool:
+        return self._conn is not None and not self._conn.is_closed()
+
+    async def _ensure_listening(self) -> None:
+        if not self.enabled or self.listening or time.monotonic() < self._next_connect_attempt:
+            return
+        try:
+            conn = await connect_raw()
+            await conn.add_listener(JOBS_READY_CHANNEL, self._on_notify)
+            self._conn = conn
+            print(f"Listening on '{JOBS_READY_CHANNEL}' for job wakeups", flush=True)
+        except Exception as e:
+            self._conn = None
+            self._next_connect_attempt = time.monotonic() + self.fallback_seconds
+            print(f"LISTEN unavailable, polling every {self.poll_seconds}s: {e}", flush=True)
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        self.wake_at(_parse_run_at(payload))
+
+    def wake_at(self, when: Optional[datetime]) -> None:
+        """Wake now if `when` is unset or past, otherwise arm the timer if `when` is the earliest known."""
+        now = datetime.now(timezone.utc)
+        if when is None or when <= now:
+            self._event.set()
+            return
+        if self._timer_at is not None and self._timer_at <= when:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer_at = when
+        self._timer = asyncio.get_running_loop().call_later((when - now).total_seconds(), self._fire)
+
+    def _fire(self) -> None:
+        self._timer = None
+        self._timer_at = None
+        self._event.set()
+
+    async def wait(self) -> None:
+        """Block until a wakeup or the fallback poll interval elapses."""
+        await self._ensure_listening()
+        timeout = self.fallback_seconds if self.listening else self.poll_seconds
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._event.clear()
+
+    async def close(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        if self._conn is not None and not self._conn.is_closed():
+            await self._conn.close()
+        self._conn = None
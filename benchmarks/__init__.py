@@ -0,0 +1 @@
+# Benchmarks (run against a disposable Postgres; see each module's docstring)
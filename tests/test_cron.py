@@ -0,0 +1,37 @@
+"""Cron expression parsing and next-fire tests."""
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core.cron import parse_cron
+from app.services.scheduling import next_cron_run
+
+
+def test_next_after_steps_and_ranges():
+    schedule = parse_cron("*/15 9-17 * * mon-fri")
+    # Friday 17:50 -> Monday 09:00
+    assert schedule.next_after(datetime(2026, 3, 6, 17, 50)) == datetime(2026, 3, 9, 9, 0)
+    assert schedule.next_after(datetime(2026, 3, 9, 9, 0)) == datetime(2026, 3, 9, 9, 15)
+
+
+def test_day_of_month_or_weekday_when_both_restricted():
+    schedule = parse_cron("0 0 1 * sun")
+    # 2026-03-01 is a Sunday; next match is the following Sunday, not April 1st
+    assert schedule.next_after(datetime(2026, 3, 1, 0, 0)) == datetime(2026, 3, 8, 0, 0)
+
+
+def test_macros_and_cache():
+    assert parse_cron("@hourly") is parse_cron("@hourly")
+    assert parse_cron("@daily").next_after(datetime(2026, 1, 1, 12, 0)) == datetime(2026, 1, 2, 0, 0)
+
+
+@pytest.mark.parametrize("expr", ["* * * *", "60 * * * *", "*/0 * * * *", "0 0 30 2 *"])
+def test_invalid_or_never_firing_expressions(expr):
+    with pytest.raises(ValueError):
+        parse_cron(expr).next_after(datetime(2026, 1, 1))
+
+
+def test_next_cron_run_uses_timezone():
+    after = datetime(2026, 7, 1, 0, 0, tzinfo=timezone.utc)
+    # 09:00 in New York (EDT, UTC-4) is 13:00 UTC
+    assert next_cron_run("0 9 * * *", "America/New_York", after) == datetime(2026, 7, 1, 13, 0, tzinfo=timezone.utc)
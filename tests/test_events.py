@@ -0,0 +1,45 @@
+"""Live job event fan-out tests (the broker behind GET /api/jobs/events)."""
+import asyncio
+import json
+
+import pytest
+
+from app.db.notify import job_event
+from app.services.events import JobEventBroker, format_sse, parse_event
+
+
+def _event(name: str, job_id: str):
+    return parse_event(json.dumps(job_event(name, job_id, status="RUNNING")))
+
+
+def test_parse_and_format_event():
+    event = _event("job_status", "a")
+    assert (event.event, event.job_id) == ("job_status", "a")
+    assert format_sse(event) == f"event: job_status\ndata: {event.data}\n\n"
+    assert parse_event("not json") is None
+    assert parse_event('{"job_id": "a"}') is None
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_gets_resync_instead_of_backlog():
+    broker = JobEventBroker(queue_size=2)
+    async with broker.subscribe() as slow, broker.subscribe() as other:
+        for _ in range(3):
+            broker.publish(_event("job_status", "a"))
+        assert [slow.get_nowait().event for _ in range(slow.qsize())] == ["resync"]
+        assert other.qsize() == 1
+    assert broker.subscriber_count == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_filters_by_job():
+    broker = JobEventBroker()
+    stream = broker.stream(job_id="b", keepalive_seconds=5)
+    assert await stream.__anext__() == "retry: 3000\n\n"
+    nxt = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    broker.publish(_event("job_status", "a"))
+    broker.publish(_event("execution_finished", "b"))
+    message = await asyncio.wait_for(nxt, 1)
+    assert message.startswith("event: execution_finished\n")
+    await stream.aclose()
@@ -0,0 +1,40 @@
+"""Export formatting tests (GET /api/jobs/export, /api/jobs/executions/export)."""
+import csv
+import io
+import json
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from app.models.job import JobStatus
+from app.services.export import csv_header, format_rows, jobs_export_query
+
+
+def test_format_rows_ndjson_and_csv():
+    row = SimpleNamespace(
+        id=uuid.UUID(int=1),
+        status=JobStatus.SCHEDULED,
+        run_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        payload={"url": "https://example.com", "n": 1},
+        timeout_seconds=None,
+    )
+    fields = ("id", "status", "run_at", "payload", "timeout_seconds")
+    line = json.loads(format_rows([row], fields, "ndjson"))
+    assert line == {
+        "id": str(uuid.UUID(int=1)),
+        "status": "SCHEDULED",
+        "run_at": "2026-01-01T00:00:00+00:00",
+        "payload": {"url": "https://example.com", "n": 1},
+        "timeout_seconds": None,
+    }
+    parsed = list(csv.reader(io.StringIO(csv_header(fields) + format_rows([row, row], fields, "csv"))))
+    assert parsed[0] == list(fields)
+    assert len(parsed) == 3
+    assert json.loads(parsed[1][3]) == {"url": "https://example.com", "n": 1}
+    assert parsed[1][4] == ""
+
+
+def test_jobs_export_query_filters_and_orders_by_keyset_index():
+    sql = str(jobs_export_query(status=JobStatus.FAILED, created_after=datetime(2026, 1, 1, tzinfo=timezone.utc)))
+    assert "jobs.status = " in sql and "jobs.created_at >= " in sql
+    assert sql.endswith("ORDER BY jobs.created_at, jobs.id")
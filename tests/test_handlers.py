@@ -0,0 +1,156 @@
+"""Job handler registry tests (job_type -> handler)."""
+import asyncio
+import os
+import time
+
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.schemas.job import JobCreate
+from app.worker.cpu import close_cpu_pool
+from app.worker.handlers import JobContext, get_handler, register_handler, resolve_callable, run_handler
+
+
+def _ctx(job_type: str, **payload) -> JobContext:
+    return JobContext("00000000-0000-0000-0000-000000000001", "t", job_type, "one_time", 1, payload)
+
+
+@pytest.mark.asyncio
+async def test_builtin_and_custom_handlers():
+    assert {get_handler(n).kind for n in ("webhook", "shell", "python", "noop", "demo")} == {"io"}
+    assert await run_handler(_ctx("noop")) == (True, None)
+    ok, message = await run_handler(_ctx("webhook", webhook_url="ftp://nope"))
+    assert not ok and "webhook_url" in message
+
+    @register_handler("test_cpu_sum", kind="cpu")
+    def cpu_sum(job_id: str, payload: dict):
+        return True, str(sum(payload["values"]))
+
+    # Registered only in this process, so run it on the thread fallback of the CPU lane
+    settings_processes = settings.WORKER_CPU_PROCESSES
+    settings.WORKER_CPU_PROCESSES = 0
+    try:
+        assert await run_handler(_ctx("test_cpu_sum", values=[1, 2, 3])) == (True, "6")
+        assert (await run_handler(_ctx("test_cpu_sum", values=None)))[1].startswith("TypeError")
+    finally:
+        settings.WORKER_CPU_PROCESSES = settings_processes
+    assert (await run_handler(_ctx("nope")))[0] is False
+    with pytest.raises(TypeError):
+        register_handler("test_sync_io")(lambda ctx: (True, None))
+
+
+@pytest.mark.asyncio
+async def test_shell_and_python_handlers_are_gated(monkeypatch):
+    ok, message = await run_handler(_ctx("shell", command="echo hi"))
+    assert not ok and "disabled" in message
+
+    monkeypatch.setattr(settings, "WORKER_SHELL_HANDLER_ENABLED", True)
+    assert await run_handler(_ctx("shell", command=["echo", "hi"])) == (True, "hi")
+    ok, message = await run_handler(_ctx("shell", command="false"))
+    assert not ok and message.startswith("Exit code 1")
+    ok, message = await run_handler(_ctx("shell", command="no-such-binary-for-tests"))
+    assert not ok and message.startswith("FileNotFoundError")
+
+    monkeypatch.setattr(settings, "WORKER_PYTHON_HANDLER_ENABLED", True)
+    # Enabled without an allowlist is still off: nothing may be imported by default
+    ok, message = await run_handler(_ctx("python", callable="os:system", args=["true"]))
+    assert not ok and "disabled" in message
+    with pytest.raises(ValueError):
+        resolve_callable("os:system")
+
+    monkeypatch.setattr(settings, "WORKER_PYTHON_HANDLER_MODULES", "math")
+    assert await run_handler(_ctx("python", callable="math:hypot", args=[3, 4])) == (True, "5.0")
+    ok, message = await run_handler(_ctx("python", callable="math:sqrt", args=[-1]))
+    assert not ok and message == "ValueError: math domain error"
+    monkeypatch.setattr(settings, "WORKER_PYTHON_HANDLER_MODULES", "app.services")
+    with pytest.raises(ValueError):
+        resolve_callable("math:hypot")
+    assert resolve_callable("app.services.scheduling.next_cron_run")
+
+
+def test_job_create_validates_job_type():
+    base = {"name": "j", "schedule_type": "interval", "interval_seconds": 60}
+    # Without job_type: webhook when there is a URL to call, else the demo work such jobs always ran
+    assert JobCreate(**base).job_type == "demo"
+    assert JobCreate(**base, payload={"callback_url": "https://example.com/hook"}).job_type == "webhook"
+    with pytest.raises(ValidationError, match="unknown job_type"):
+        JobCreate(**base, job_type="missing")
+    with pytest.raises(ValidationError, match="disabled"):
+        JobCreate(**base, job_type="shell")
+
+
+def test_job_create_rejects_payloads_the_handler_cannot_run(monkeypatch):
+    """A webhook without an http(s) URL or a shell job without a command is a 422, not a run of failures."""
+    base = {"name": "j", "schedule_type": "interval", "interval_seconds": 60}
+    with pytest.raises(ValidationError, match="payload.webhook_url"):
+        JobCreate(**base, job_type="webhook")
+    with pytest.raises(ValidationError, match="payload.webhook_url"):
+        JobCreate(**base, job_type="webhook", payload={"webhook_url": "ftp://nope"})
+    monkeypatch.setattr(settings, "WORKER_SHELL_HANDLER_ENABLED", True)
+    with pytest.raises(ValidationError, match="payload.command"):
+        JobCreate(**base, job_type="shell", payload={"command": []})
+    assert JobCreate(**base, job_type="shell", payload={"command": "echo hi"}).job_type == "shell"
+
+
+def _enable_python_cpu(monkeypatch) -> None:
+    """In this process and, through the environment, in the spawned CPU lane children."""
+    for name, value in (("WORKER_PYTHON_HANDLER_ENABLED", True), ("WORKER_PYTHON_HANDLER_MODULES", "os,math,time")):
+        monkeypatch.setenv(name, str(value).lower())
+        monkeypatch.setattr(settings, name, value)
+
+
+@pytest.mark.asyncio
+async def test_cpu_handlers_run_in_process_pool(monkeypatch):
+    """python_cpu runs in a spawned child that reads its own settings; only type, id and payload cross over."""
+    _enable_python_cpu(monkeypatch)
+    monkeypatch.setattr(settings, "WORKER_CPU_PROCESSES", 1)
+    try:
+        ok, result = await run_handler(_ctx("python_cpu", callable="os:getpid"))
+        assert ok and int(result) != os.getpid()
+        assert await run_handler(_ctx("python_cpu", callable="math:factorial", args=[20])) == (True, "2432902008176640000")
+    finally:
+        await close_cpu_pool()
+
+
+@pytest.mark.asyncio
+async def test_cpu_lane_kills_abandoned_jobs(monkeypatch):
+    """A timed-out cpu job's process is killed and replaced, so it does not keep the only slot busy."""
+    _enable_python_cpu(monkeypatch)
+    monkeypatch.setattr(settings, "WORKER_CPU_PROCESSES", 1)
+    try:
+        ok, first_pid = await run_handler(_ctx("python_cpu", callable="os:getpid"))
+        assert ok
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(run_handler(_ctx("python_cpu", callable="time:sleep", args=[60])), 1)
+        ok, pid = await asyncio.wait_for(run_handler(_ctx("python_cpu", callable="os:getpid")), 30)
+        assert ok and pid != first_pid
+        # The killed child is reaped asynchronously
+        for _ in range(50):
+            try:
+                os.kill(int(first_pid), 0)
+            except ProcessLookupError:
+                break
+            await asyncio.sleep(0.1)
+        else:
+            pytest.fail("abandoned cpu job's process is still alive")
+    finally:
+        await close_cpu_pool()
+
+
+@pytest.mark.asyncio
+async def test_close_cpu_pool_does_not_wait_for_hung_jobs(monkeypatch):
+    """Shutdown kills a busy lane process instead of waiting for its computation to finish."""
+    _enable_python_cpu(monkeypatch)
+    monkeypatch.setattr(settings, "WORKER_CPU_PROCESSES", 1)
+    try:
+        assert (await run_handler(_ctx("python_cpu", callable="os:getpid")))[0]
+        hung = asyncio.create_task(run_handler(_ctx("python_cpu", callable="time:sleep", args=[60])))
+        await asyncio.sleep(0.5)
+        started = time.monotonic()
+        await asyncio.wait_for(close_cpu_pool(), 5)
+        ok, message = await asyncio.wait_for(hung, 5)
+        assert not ok and "died" in message
+        assert time.monotonic() - started < 5
+    finally:
+        await close_cpu_pool()
@@ -0,0 +1,85 @@
+"""JobService tests (no database required)."""
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.job import Job, JobExecution
+from app.services.job_service import JobService
+
+
+class _FakeSession:
+    """Records the statement and answers it with the given executions."""
+
+    def __init__(self, executions):
+        self.executions, self.statements = executions, []
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(stmt)
+        return SimpleNamespace(scalars=lambda: iter(self.executions))
+
+
+@pytest.mark.asyncio
+async def test_recent_executions_are_a_top_n_per_job():
+    """executions_limit reads at most N rows per job (LATERAL ... LIMIT), not every job's whole history."""
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    busy, idle = Job(id=uuid.uuid4()), Job(id=uuid.uuid4())
+    rows = [JobExecution(id=uuid.uuid4(), job_id=busy.id, started_at=now + timedelta(seconds=i)) for i in range(2)]
+    session = _FakeSession(rows)
+    await JobService(session).load_recent_executions([busy, idle], 2)
+
+    sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+    assert "JOIN LATERAL (SELECT" in sql
+    assert "ORDER BY job_executions.started_at DESC, job_executions.id DESC \n LIMIT %(param_1)s) AS latest" in sql
+    assert "row_number" not in sql
+    assert busy.executions == rows and idle.executions == []
+
+
+@pytest.mark.asyncio
+async def test_executions_limit_zero_skips_the_query():
+    """include_executions=false (limit 0) attaches empty lists without querying."""
+    session = _FakeSession([])
+    job = Job(id=uuid.uuid4())
+    await JobService(session).load_recent_executions([job], 0)
+    assert session.statements == [] and job.executions == []
+
+
+class _StatusSession:
+    """Answers get_by_id with `job` and records the UPDATE."""
+
+    def __init__(self, job):
+        self.bind = SimpleNamespace(dialect=SimpleNamespace(name="sqlite"))
+        self.job, self.updates = job, []
+
+    async def execute(self, stmt, params=None):
+        if stmt.is_select:
+            return SimpleNamespace(scalar_one_or_none=lambda: self.job)
+        self.updates.append(stmt.compile(dialect=postgresql.dialect()).params)
+        return SimpleNamespace(rowcount=1)
+
+    async def refresh(self, obj):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_cancelling_a_running_job_releases_its_lease(monkeypatch):
+    """Leaving RUNNING clears locked_by / lease_expires_at in the same version-checked UPDATE."""
+    from app.core.config import settings
+    from app.models.job import JobStatus, ScheduleType
+
+    monkeypatch.setattr(settings, "EVENTS_ENABLED", False)
+    job = Job(
+        id=uuid.uuid4(), status=JobStatus.RUNNING, schedule_type=ScheduleType.ONE_TIME, version=3,
+        locked_by="worker-1", lease_expires_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+    )
+    session = _StatusSession(job)
+    await JobService(session).update_status(job.id, JobStatus.CANCELLED)
+    params = session.updates[0]
+    assert params["status"] == JobStatus.CANCELLED
+    assert params["locked_by"] is None and params["lease_expires_at"] is None
+
+    job.status = JobStatus.PAUSED
+    await JobService(session).update_status(job.id, JobStatus.SCHEDULED)
+    assert "locked_by" not in session.updates[1]
@@ -0,0 +1,18 @@
+"""Keyset cursor encoding tests."""
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.services.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    ts = datetime(2026, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    row_id = uuid.uuid4()
+    assert decode_cursor(encode_cursor(ts, row_id)) == (ts, row_id)
+
+
+def test_decode_cursor_rejects_garbage():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
@@ -0,0 +1,26 @@
+"""Partition planning tests for job_executions (no database needed)."""
+from datetime import datetime, timezone
+
+from app.db.partitions import parse_bound, partition_name, planned_partitions
+
+
+def test_planned_monthly_partitions_roll_over_year():
+    now = datetime(2026, 11, 15, 8, 30, tzinfo=timezone.utc)
+    parts = planned_partitions(now, "month", ahead=2)
+    assert [p.name for p in parts] == ["job_executions_p20261101", "job_executions_p20261201", "job_executions_p20270101"]
+    assert parts[-1].upper == datetime(2027, 2, 1, tzinfo=timezone.utc)
+    assert all(a.upper == b.lower for a, b in zip(parts, parts[1:]))
+
+
+def test_planned_weekly_partitions_start_on_monday():
+    parts = planned_partitions(datetime(2026, 10, 17, tzinfo=timezone.utc), "week", ahead=0)
+    assert parts[0].lower == datetime(2026, 10, 12, tzinfo=timezone.utc)
+    assert partition_name(parts[0].lower) == "job_executions_p20261012"
+
+
+def test_parse_partition_bound():
+    bound = "FOR VALUES FROM ('2026-10-01 00:00:00+00') TO ('2026-11-01 00:00:00+00')"
+    lower, upper = parse_bound(bound)
+    assert lower == datetime(2026, 10, 1, tzinfo=timezone.utc)
+    assert upper == datetime(2026, 11, 1, tzinfo=timezone.utc)
+    assert parse_bound("DEFAULT") is None
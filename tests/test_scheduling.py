@@ -0,0 +1,48 @@
+"""Scheduling math tests (retry backoff, anchored recurring runs and misfire policies)."""
+from datetime import datetime, timedelta, timezone
+
+from app.models.job import MisfirePolicy, RetryPolicy
+from app.services.scheduling import compute_retry_delay, next_cron_run_after_misfire, next_interval_run
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def test_fixed_retry_delay():
+    assert compute_retry_delay(RetryPolicy.FIXED, 10, 600, attempt=5) == 10
+
+
+def test_exponential_retry_delay_is_capped():
+    delays = [compute_retry_delay(RetryPolicy.EXPONENTIAL, 5, 60, attempt=a) for a in range(1, 6)]
+    assert delays == [5, 10, 20, 40, 60]
+
+
+def test_full_jitter_stays_within_exponential_bound():
+    assert compute_retry_delay(RetryPolicy.EXPONENTIAL_JITTER, 5, 600, attempt=3, rand=lambda: 0.5) == 10
+    assert compute_retry_delay(RetryPolicy.EXPONENTIAL_JITTER, 5, 600, attempt=3, rand=lambda: 0.0) == 0
+
+
+def test_interval_runs_stay_anchored_to_schedule():
+    """A 60s job that started 2s late and ran 5s is still due at anchor + 60s, not finish + 60s."""
+    started, now = T0 + timedelta(seconds=2), T0 + timedelta(seconds=7)
+    assert next_interval_run(T0, 60, started, now, MisfirePolicy.COALESCE, 10) == T0 + timedelta(seconds=60)
+
+
+def test_interval_misfire_policies_after_outage():
+    """Worker back after ~1h: the late run covers the gap; policies differ in what follows."""
+    started = T0 + timedelta(minutes=60, seconds=10)
+    now = started + timedelta(minutes=2, seconds=30)  # two more slots came due while it ran
+    assert next_interval_run(T0, 60, started, now, MisfirePolicy.COALESCE, 10) == T0 + timedelta(minutes=61)
+    assert next_interval_run(T0, 60, started, now, MisfirePolicy.SKIP, 10) == T0 + timedelta(minutes=63)
+    # run_all replays missed slots, but only the newest max_catchup of them
+    assert next_interval_run(T0, 60, started, now, MisfirePolicy.RUN_ALL, 100) == T0 + timedelta(minutes=1)
+    assert next_interval_run(T0, 60, started, now, MisfirePolicy.RUN_ALL, 3) == T0 + timedelta(minutes=60)
+
+
+def test_cron_misfire_policies():
+    started = T0 + timedelta(hours=5, minutes=1)
+    now = started + timedelta(minutes=1)
+    hourly = ("0 * * * *", "UTC", T0, started, now)
+    assert next_cron_run_after_misfire(*hourly, MisfirePolicy.COALESCE, 10) == T0 + timedelta(hours=6)
+    assert next_cron_run_after_misfire(*hourly, MisfirePolicy.SKIP, 10) == T0 + timedelta(hours=6)
+    assert next_cron_run_after_misfire(*hourly, MisfirePolicy.RUN_ALL, 10) == T0 + timedelta(hours=1)
+    assert next_cron_run_after_misfire(*hourly, MisfirePolicy.RUN_ALL, 2) == T0 + timedelta(hours=4)
@@ -0,0 +1,53 @@
+"""Job counter delta tests (the upserts behind GET /api/jobs/stats)."""
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.job import JobStatus, ScheduleType
+from app.services.stats import bulk_status_change, reconcile_job_counters, status_change
+
+
+def test_status_change_deltas_keep_negative_counts():
+    assert status_change(ScheduleType.CRON, JobStatus.RUNNING, JobStatus.RUNNING) == {}
+    assert status_change(ScheduleType.CRON, None, JobStatus.SCHEDULED) == {(ScheduleType.CRON, JobStatus.SCHEDULED): 1}
+    deltas = bulk_status_change(
+        [ScheduleType.INTERVAL, ScheduleType.INTERVAL, ScheduleType.ONE_TIME], JobStatus.SCHEDULED, JobStatus.RUNNING
+    )
+    assert deltas[(ScheduleType.INTERVAL, JobStatus.SCHEDULED)] == -2
+    assert deltas[(ScheduleType.INTERVAL, JobStatus.RUNNING)] == 2
+    assert deltas[(ScheduleType.ONE_TIME, JobStatus.SCHEDULED)] == -1
+
+
+class _FakeResult(list):
+    def scalar_one(self):
+        return self[0]
+
+
+class _FakeSession:
+    """Records statements; answers the advisory lock and the drift query."""
+
+    def __init__(self, locked: bool, drift: list):
+        self.bind = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+        self.locked, self.drift, self.statements = locked, drift, []
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(str(stmt))
+        if "pg_try_advisory_xact_lock" in str(stmt):
+            return _FakeResult([self.locked])
+        if "FULL JOIN counted" in str(stmt):
+            return _FakeResult(self.drift)
+        return _FakeResult([])
+
+
+@pytest.mark.asyncio
+async def test_reconcile_upserts_drift_without_table_lock():
+    """One process at a time (advisory lock); the correction is a delta upsert, never LOCK TABLE / DELETE."""
+    busy = _FakeSession(locked=False, drift=[])
+    assert await reconcile_job_counters(busy) is None
+    assert len(busy.statements) == 1
+
+    drift = [SimpleNamespace(schedule_type="interval", status="SCHEDULED", drift=3)]
+    session = _FakeSession(locked=True, drift=drift)
+    assert await reconcile_job_counters(session) == 1
+    assert "INSERT INTO job_counters" in session.statements[-1]
+    assert not any("LOCK TABLE" in s or s.startswith("DELETE") for s in session.statements)
@@ -0,0 +1,388 @@
+"""Worker unit tests (no database required)."""
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.job import Job
+from app.worker.pool import JobPool
+
+
+@pytest.mark.asyncio
+async def test_job_pool_bounds_in_flight_jobs():
+    """Pool reports free slots and frees them as jobs finish."""
+    release = asyncio.Event()
+
+    async def runner(job: Job) -> bool:
+        await release.wait()
+        return True
+
+    pool = JobPool(2, runner)
+    pool.submit(Job(id=uuid.uuid4()))
+    pool.submit(Job(id=uuid.uuid4()))
+    assert pool.free_slots == 0
+
+    release.set()
+    await pool.wait_for_slot()
+    await pool.drain()
+    await asyncio.sleep(0)
+    assert pool.free_slots == 2
+
+
+@pytest.mark.asyncio
+async def test_wakeup_fires_for_due_and_future_jobs():
+    """A due job wakes at once; a future run_at arms a timer that wakes later."""
+    from datetime import datetime, timedelta, timezone
+
+    from app.worker.wakeup import JobWakeup
+
+    wakeup = JobWakeup(fallback_seconds=5, poll_seconds=5, enabled=False)
+    wakeup.wake_at(None)
+    await asyncio.wait_for(wakeup.wait(), 1)
+
+    wakeup.wake_at(datetime.now(timezone.utc) + timedelta(milliseconds=50))
+    await asyncio.wait_for(wakeup.wait(), 1)
+    await wakeup.close()
+
+
+@pytest.mark.asyncio
+async def test_http_client_is_shared_until_closed():
+    """Executions reuse one pooled client; closing it lets the next call build a fresh one."""
+    from app.worker.http import close_http_client, get_http_client
+
+    client = get_http_client()
+    assert get_http_client() is client
+    await close_http_client()
+    assert client.is_closed
+    assert get_http_client() is not client
+    await close_http_client()
+
+
+@pytest.mark.asyncio
+async def test_execution_timeout_and_cancellation(monkeypatch):
+    """Executions past their deadline time out; a lost lease cancels the running work."""
+    from app.models.job import ExecutionStatus
+    from app.worker import main as worker
+    from app.worker.leases import LeaseKeeper
+
+    async def hang(job):
+        await asyncio.sleep(10)
+        return True, "done"
+
+    monkeypatch.setattr(worker, "execute_job", hang)
+    monkeypatch.setattr(worker, "DEFAULT_TIMEOUT", 0.05)
+    job = Job(id=uuid.uuid4())
+    outcome, message = await worker._execute_with_deadline(job, None)
+    assert outcome == ExecutionStatus.TIMEOUT
+
+    monkeypatch.setattr(worker, "DEFAULT_TIMEOUT", 10)
+    leases = LeaseKeeper("test-worker", lease_seconds=30, heartbeat_seconds=10)
+    leases.track([job.id])
+    running = asyncio.create_task(worker._execute_with_deadline(job, leases))
+    await asyncio.sleep(0.01)
+    leases._abort({job.id})
+    outcome, message = await asyncio.wait_for(running, 1)
+    assert outcome == ExecutionStatus.CANCELLED
+
+
+@pytest.mark.asyncio
+async def test_cron_tick_budget_interrupts_execution(monkeypatch):
+    """A cron tick's remaining budget interrupts the run instead of timing it out."""
+    from app.models.job import ExecutionStatus
+    from app.worker import main as worker
+
+    async def hang(job):
+        await asyncio.sleep(10)
+        return True, "done"
+
+    monkeypatch.setattr(worker, "execute_job", hang)
+    monkeypatch.setattr(worker, "DEFAULT_TIMEOUT", 10)
+    outcome, message = await worker._execute_with_deadline(Job(id=uuid.uuid4()), None, budget=0.05)
+    assert outcome == ExecutionStatus.CANCELLED
+    assert "budget" in message
+
+
+@pytest.mark.asyncio
+async def test_cron_tick_lateness_excludes_run_time(monkeypatch):
+    """lateness_ms is measured when the job starts, so a slow handler does not add to it."""
+    import time
+    from datetime import datetime, timedelta, timezone
+
+    from app.worker import main as worker
+
+    async def slow(job, leases, budget):
+        await asyncio.sleep(0.3)
+        return "completed"
+
+    monkeypatch.setattr(worker, "run_claimed_job", slow)
+    job = Job(id=uuid.uuid4(), name="slow", run_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+    timing = await worker._run_timed_job(job, None, time.monotonic(), None)
+    assert timing["duration_ms"] >= 300
+    assert 1000 <= timing["lateness_ms"] < 1250
+
+
+class _FakeSession:
+    """Async session stand-in: records statements and answers each with the given rows."""
+
+    def __init__(self, rows):
+        self.bind = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+        self.rows, self.statements, self.committed = rows, [], False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(stmt)
+        rows = self.rows if len(self.statements) == 1 else []
+        return SimpleNamespace(all=lambda: rows, scalars=lambda: SimpleNamespace(all=lambda: rows))
+
+    async def commit(self):
+        self.committed = True
+
+    async def rollback(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_lease_renewal_aborts_jobs_it_no_longer_owns(monkeypatch):
+    """renew() extends leases it still holds; a job that was not renewed has its execution cancelled."""
+    from app.worker import leases as lease_module
+    from app.worker.leases import LeaseKeeper
+
+    kept, lost = uuid.uuid4(), uuid.uuid4()
+    session = _FakeSession([kept])
+    monkeypatch.setattr(lease_module, "async_session_factory", lambda: session)
+    leases = LeaseKeeper("test-worker", lease_seconds=30, heartbeat_seconds=10)
+    leases.track([kept, lost])
+    kept_work, lost_work = asyncio.ensure_future(asyncio.sleep(10)), asyncio.ensure_future(asyncio.sleep(10))
+    leases.watch(kept, kept_work)
+    leases.watch(lost, lost_work)
+
+    assert await leases.renew() == {kept}
+    assert session.committed
+    await asyncio.sleep(0)
+    assert lost_work.cancelled() and not kept_work.done()
+    assert leases.lost == {lost} and leases.job_ids == {kept}
+
+    # Lost before its execution was registered: watch() cancels it straight away
+    late = asyncio.ensure_future(asyncio.sleep(10))
+    leases.watch(lost, late)
+    await asyncio.sleep(0)
+    assert late.cancelled()
+    kept_work.cancel()
+
+
+@pytest.mark.asyncio
+async def test_recovery_resets_jobs_with_expired_leases(monkeypatch):
+    """Expired-lease RUNNING jobs go back to SCHEDULED, with counter deltas and a recovered event."""
+    from sqlalchemy.dialects import postgresql
+
+    from app.core.config import settings
+    from app.models.job import ScheduleType
+    from app.worker.main import reset_stale_running_jobs
+
+    monkeypatch.setattr(settings, "EVENTS_ENABLED", True)
+    job_id = uuid.uuid4()
+    session = _FakeSession([SimpleNamespace(id=job_id, schedule_type=ScheduleType.INTERVAL)])
+    assert await reset_stale_running_jobs(session) == 1
+
+    reset_sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+    assert "jobs.lease_expires_at < now()" in reset_sql
+    assert "lease_expires_at=%(lease_expires_at)s" in reset_sql
+    counters, notify = (str(s) for s in session.statements[1:])
+    assert "INSERT INTO job_counters" in counters
+    assert "pg_notify" in notify
+
+
+def test_next_job_state_transitions():
+    """Success completes or reschedules; failure retries with backoff until max_retries."""
+    from datetime import datetime, timedelta, timezone
+
+    from app.models.job import ExecutionStatus, JobStatus, RetryPolicy, ScheduleType
+    from app.worker.main import next_job_state
+
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    one_time = Job(
+        schedule_type=ScheduleType.ONE_TIME,
+        retry_count=0,
+        max_retries=2,
+        retry_policy=RetryPolicy.FIXED,
+        retry_delay_seconds=30,
+        retry_max_delay_seconds=600,
+    )
+    assert next_job_state(one_time, ExecutionStatus.SUCCESS, now) == ({"status": JobStatus.COMPLETED}, None)
+    state, delay = next_job_state(one_time, ExecutionStatus.TIMEOUT, now)
+    assert delay == 30
+    assert state["status"] == JobStatus.SCHEDULED
+    assert state["retry_count"] == 1
+    assert (state["run_at"] - now).total_seconds() == 30
+    one_time.retry_count = 1
+    assert next_job_state(one_time, ExecutionStatus.FAILED, now) == ({"status": JobStatus.FAILED}, None)
+
+    interval = Job(
+        schedule_type=ScheduleType.INTERVAL, interval_seconds=60, run_at=now, retry_count=0, max_retries=3
+    )
+    finished = now + timedelta(seconds=4)
+    state, _ = next_job_state(interval, ExecutionStatus.SUCCESS, finished, started=now)
+    assert state["status"] == JobStatus.SCHEDULED
+    assert (state["run_at"] - now).total_seconds() == 60  # anchored to run_at, not to the finish time
+
+
+def test_execution_totals_roll_up_outcomes():
+    from app.models.job import ExecutionStatus
+    from app.worker.main import execution_totals
+
+    assert set(execution_totals(ExecutionStatus.SUCCESS, 1.5)) == {"run_count", "last_duration_seconds", "success_count"}
+    assert "failure_count" in execution_totals(ExecutionStatus.TIMEOUT, 30.0)
+    assert set(execution_totals(ExecutionStatus.CANCELLED, None)) == {"run_count", "last_duration_seconds"}
+
+
+def test_skip_policy_detects_misfired_runs():
+    from datetime import datetime, timedelta, timezone
+
+    from app.models.job import MisfirePolicy, ScheduleType
+    from app.worker.main import run_is_misfired
+
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    job = Job(schedule_type=ScheduleType.INTERVAL, interval_seconds=60, misfire_policy=MisfirePolicy.SKIP)
+    job.run_at = now - timedelta(seconds=30)
+    assert not run_is_misfired(job, now)
+    job.run_at = now - timedelta(seconds=90)
+    assert run_is_misfired(job, now)
+
+
+def test_weighted_queues_share_slots_without_starvation():
+    """Slots follow the weights over a cycle, and a weight-1 queue gets a turn in every cycle."""
+    from app.worker.queues import WeightedQueues, parse_queue_weights, worker_queues
+
+    assert parse_queue_weights("critical:5, default ,bulk:1") == {"critical": 5, "default": 1, "bulk": 1}
+    assert worker_queues("") is None
+    for bad in ("critical:0", "critical:x", ":3"):
+        with pytest.raises(ValueError):
+            parse_queue_weights(bad)
+
+    queues = WeightedQueues({"critical": 5, "default": 1})
+    assert queues.plan(12) == {"critical": 10, "default": 2}
+    # One slot per claim: the low-weight queue still comes up once every 6 claims
+    picks = [queues.next() for _ in range(6)]
+    assert picks.count("default") == 1
+    assert [queues.next() for _ in range(6)] == picks
+
+    heavy = WeightedQueues({"bulk": 100, "rare": 1})
+    assert "rare" in [heavy.next() for _ in range(101)]
+
+
+def test_worker_queues_are_parsed_on_first_use(monkeypatch):
+    """A bad WORKER_QUEUES fails when the worker asks for it, not when app.worker.main is imported."""
+    from app.core.config import settings
+    from app.worker.queues import configured_queues
+
+    monkeypatch.setattr(settings, "WORKER_QUEUES", "critical:zero")
+    configured_queues.cache_clear()
+    try:
+        with pytest.raises(ValueError):
+            configured_queues()
+    finally:
+        configured_queues.cache_clear()
+
+
+def test_claim_scans_each_priority_band_by_run_at():
+    """Within a band the due rows are a run_at range (ORDER BY run_at), so future jobs are never walked."""
+    from datetime import datetime, timezone
+
+    from sqlalchemy.dialects import postgresql
+
+    from app.worker.main import _ready_ids
+
+    sql = str(_ready_ids(datetime.now(timezone.utc), 5, "critical").compile(dialect=postgresql.dialect()))
+    assert sql.startswith("WITH RECURSIVE bands")
+    assert "jobs.priority = bands.priority AND jobs.run_at <=" in sql
+    # Bands are read without locks; only the `limit` rows claimed are locked, after a status re-check
+    assert sql.count("FOR UPDATE") == 1
+    assert sql.endswith("ORDER BY jobs.priority DESC, jobs.run_at ASC \n LIMIT %(param_3)s FOR UPDATE SKIP LOCKED")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_claim_is_not_starved():
+    """A claim locks only the rows it takes, so a second worker claiming meanwhile still fills its batch."""
+    from datetime import datetime, timedelta, timezone
+
+    from sqlalchemy import delete, text
+
+    from app.db.session import async_session_factory
+    from app.models.job import JobStatus, ScheduleType
+    from app.worker.main import claim_jobs
+    from app.worker.queues import WeightedQueues
+
+    queue = f"test-{uuid.uuid4().hex[:8]}"
+    now = datetime.now(timezone.utc)
+    try:
+        async with async_session_factory() as session:
+            await session.execute(text("SELECT 1"))
+    except Exception:
+        pytest.skip("Database not available (set DATABASE_URL in .env to run this test)")
+    async with async_session_factory() as session:
+        # Three priority bands, 4 due jobs each: each band alone could cover a 4-job claim
+        session.add_all(
+            Job(
+                name=queue, queue=queue, priority=i % 3, schedule_type=ScheduleType.ONE_TIME,
+                run_at=now - timedelta(seconds=i + 1), status=JobStatus.SCHEDULED,
+            )
+            for i in range(12)
+        )
+        await session.commit()
+    only_queue = WeightedQueues({queue: 1})
+    first, second = async_session_factory(), async_session_factory()
+    try:
+        a = await claim_jobs(first, 4, only_queue)
+        b = await claim_jobs(second, 4, only_queue)
+        assert len(a) == len(b) == 4
+        assert not {j.id for j in a} & {j.id for j in b}
+        assert all(j.priority == 2 for j in a)
+    finally:
+        await first.rollback()
+        await second.rollback()
+        await first.close()
+        await second.close()
+        async with async_session_factory() as session:
+            await session.execute(delete(Job).where(Job.queue == queue))
+            await session.commit()
+
+
+def test_retry_keeps_recurring_job_on_its_grid():
+    """fail -> retry (off the grid) -> success: the next run is the slot after the retried one, not retry time + interval."""
+    from datetime import datetime, timedelta, timezone
+
+    from app.models.job import ExecutionStatus, JobStatus, RetryPolicy, ScheduleType
+    from app.worker.main import next_job_state
+
+    slot = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+    job = Job(
+        schedule_type=ScheduleType.INTERVAL,
+        interval_seconds=60,
+        run_at=slot,
+        retry_count=0,
+        max_retries=3,
+        retry_policy=RetryPolicy.FIXED,
+        retry_delay_seconds=7,
+        retry_max_delay_seconds=600,
+    )
+    failed, _ = next_job_state(job, ExecutionStatus.FAILED, slot + timedelta(seconds=2), started=slot)
+    assert failed["run_at"] == slot + timedelta(seconds=9)
+    assert failed["retry_of_run_at"] == slot
+
+    # Second failure keeps the original slot
+    job.run_at, job.retry_count, job.retry_of_run_at = failed["run_at"], 1, failed["retry_of_run_at"]
+    failed, _ = next_job_state(job, ExecutionStatus.FAILED, job.run_at + timedelta(seconds=1), started=job.run_at)
+    assert failed["retry_of_run_at"] == slot
+
+    job.run_at, job.retry_count = failed["run_at"], 2
+    retry_started = job.run_at
+    state, _ = next_job_state(job, ExecutionStatus.SUCCESS, retry_started + timedelta(seconds=1), started=retry_started)
+    assert state["status"] == JobStatus.SCHEDULED
+    assert state["run_at"] == slot + timedelta(seconds=60)
+    assert state["retry_of_run_at"] is None